@@ -0,0 +1,53 @@
+import numpy as np
+import shuffle_algebra
+
+
+def shuffle_batch(decks, modified_overhand=0, mongean=0):
+    """
+    Shuffles many decks at once, the same way `Deck.shuffle` does: one
+    modified overhand shuffle, then the Mongean shuffles.
+
+    Parameters:
+        decks: array of shape (n_decks, deck_len) holding card codes
+        (uint8). It is not modified.
+        modified_overhand: overhand count for each deck, or one count for
+        all decks.
+        mongean: Mongean count for each deck, or one count for all decks.
+    Returns:
+        A new (n_decks, deck_len) array with each row shuffled.
+
+    >>> from shuffle import Shuffle
+    >>> from numpy.random import RandomState
+    >>> rng = RandomState(0)
+    >>> decks = np.tile(np.arange(52, dtype=np.uint8), (1000, 1))
+    >>> num_modified = rng.randint(0, 5, size=1000)
+    >>> num_mongean = rng.randint(0, 5, size=1000)
+    >>> result = shuffle_batch(decks, num_modified, num_mongean)
+    >>> result.shape, result.dtype
+    ((1000, 52), dtype('uint8'))
+    >>> expected = []
+    >>> for i in range(1000):
+    ...     cards = Shuffle.modified_overhand(list(decks[i]), int(num_modified[i]))
+    ...     for j in range(num_mongean[i]):
+    ...         cards = Shuffle.mongean(cards)
+    ...     expected.append(cards)
+    >>> bool((result == np.array(expected, dtype=np.uint8)).all())
+    True
+    """
+    decks = np.asarray(decks)
+    assert decks.ndim == 2
+    n_decks, deck_len = decks.shape
+    counts = np.empty((n_decks, 2), dtype=np.int64)
+    counts[:, 0] = modified_overhand
+    counts[:, 1] = mongean
+    assert (counts >= 0).all()
+    assert (counts[:, 0] <= deck_len).all()
+    counts[:, 1] = counts[:, 1] % shuffle_algebra.order(deck_len)
+    # Only the distinct count pairs need a permutation table. Each deck then
+    # picks its table row and all decks are gathered in one call.
+    pairs, which = np.unique(counts, axis=0, return_inverse=True)
+    tables = np.array([
+        shuffle_algebra.schedule(deck_len, int(i[0]), int(i[1])).table
+        for i in pairs], dtype=np.intp).reshape(len(pairs), deck_len)
+    index = tables[which.reshape(-1)]
+    return decks[np.arange(n_decks)[:, None], index]
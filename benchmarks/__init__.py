@@ -0,0 +1,3 @@
+from benchmarks.bench import (case_key, measure, run_all, write_results,
+                              read_results, compare)
+from benchmarks.cases import all_cases
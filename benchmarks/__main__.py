@@ -0,0 +1,48 @@
+# Runs the benchmarks from the repository root:
+#
+#     python -m benchmarks --output results.json
+#     python -m benchmarks --baseline baseline.json --threshold 0.2
+#
+# The exit status is 1 when a case is slower than the baseline by more than
+# the threshold.
+import argparse
+import sys
+from benchmarks.bench import run_all, write_results, read_results, compare
+from benchmarks.cases import all_cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--output', default='bench_results.json',
+                        help='JSON file to write the results to')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed throughput drop, as a fraction')
+    parser.add_argument('--quick', action='store_true',
+                        help='leave out the largest sizes')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='minimum seconds per timing run')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', default='',
+                        help='only run cases whose name contains this')
+    args = parser.parse_args(argv)
+
+    cases = [i for i in all_cases(args.quick) if args.filter in i[0]]
+    results = run_all(cases, args.min_time, args.repeat)
+    for i in results:
+        print('%-50s %14.1f %s/s %10.1f KiB' % (
+            i['key'], i['throughput'], i['unit'], i['peak_bytes'] / 1024))
+    write_results(results, args.output)
+
+    if args.baseline:
+        regressions = compare(results, read_results(args.baseline),
+                              args.threshold)
+        for key, old, new in regressions:
+            print('REGRESSION %s: %.1f -> %.1f' % (key, old, new))
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import json
+import time
+import tracemalloc
+
+
+def case_key(name, params):
+    """
+    Returns the key a result is stored under, such as
+    'play_round[logging=False,num_rounds=100]'.
+
+    >>> case_key('play_round', {'num_rounds': 100, 'logging': False})
+    'play_round[logging=False,num_rounds=100]'
+    """
+    text = ','.join([k + '=' + str(params[k]) for k in sorted(params)])
+    return name + '[' + text + ']'
+
+
+def measure(name, params, factory, min_time=0.2, repeat=3):
+    """
+    Times one benchmark case and measures its peak memory.
+
+    The timed callable is run enough times to take at least `min_time`
+    seconds, `repeat` times over, and the fastest run is kept. Peak memory
+    comes from a separate run under tracemalloc, so tracing does not slow
+    the timing.
+
+    Returns:
+        A dictionary with the case, seconds per call, throughput in units
+        per second and peak memory in bytes.
+
+    >>> def factory(n):
+    ...     return (lambda: sum(range(n))), n, 'items'
+    >>> result = measure('sum', {'n': 1000}, factory, min_time=0.01)
+    >>> result['key'], result['unit'], result['peak_bytes'] >= 0
+    ('sum[n=1000]', 'items', True)
+    """
+    run, count, unit = factory(**params)
+    number = 1
+    while 1:
+        start = time.perf_counter()
+        for i in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = number * 2
+    best = elapsed / number
+    for i in range(repeat - 1):
+        start = time.perf_counter()
+        for j in range(number):
+            run()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'key': case_key(name, params),
+        'name': name,
+        'params': params,
+        'seconds': best,
+        'throughput': count / best,
+        'unit': unit,
+        'peak_bytes': peak,
+    }
+
+
+def run_all(cases, min_time=0.2, repeat=3):
+    """
+    Measures every (name, params, factory) case in `cases`.
+    """
+    return [measure(name, params, factory, min_time, repeat)
+            for name, params, factory in cases]
+
+
+def write_results(results, filename):
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({'results': results}, f, indent=2)
+
+
+def read_results(filename):
+    with open(filename, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Returns the cases whose throughput dropped by more than `threshold`
+    (a fraction) against `baseline`, as (key, baseline, current) tuples.
+    Cases missing from either side are skipped.
+
+    >>> old = [{'key': 'a', 'throughput': 100.0},
+    ...        {'key': 'b', 'throughput': 100.0}]
+    >>> new = [{'key': 'a', 'throughput': 85.0},
+    ...        {'key': 'b', 'throughput': 75.0},
+    ...        {'key': 'c', 'throughput': 1.0}]
+    >>> compare(new, old, threshold=0.2)
+    [('b', 100.0, 75.0)]
+    """
+    old = {i['key']: i['throughput'] for i in baseline}
+    regressions = []
+    for i in results:
+        if i['key'] not in old:
+            continue
+        if i['throughput'] < old[i['key']] * (1 - threshold):
+            regressions.append((i['key'], old[i['key']], i['throughput']))
+    return regressions
@@ -0,0 +1,116 @@
+# Benchmark cases. Each case is a function taking its parameters and
+# returning (run, count, unit): `run` is the timed callable and `count` the
+# number of `unit`s it processes per call.
+import os
+import random
+import tempfile
+from card import Card
+from shuffle import Shuffle
+from hand import PlayerHand
+from shoe import Shoe
+from blackjack import Blackjack
+from summary_writer import MemorySink, SummaryWriter
+
+DECK_SIZES = [52, 104, 208, 416]
+ROUND_COUNTS = [1, 100, 10000, 100000]
+
+
+def shuffle_mongean(num_cards):
+    cards = list(range(num_cards))
+
+    def run():
+        Shuffle.mongean(cards)
+    return run, num_cards, 'cards'
+
+
+def shuffle_overhand(num_cards):
+    cards = list(range(num_cards))
+
+    def run():
+        Shuffle.modified_overhand(cards, 5)
+    return run, num_cards, 'cards'
+
+
+def deck_deal_hand(num_cards):
+    def run():
+        shoe = Shoe(num_cards // 52, penetration=1)
+        hand = PlayerHand()
+        for i in range(num_cards):
+            shoe.deal_hand(hand)
+            if len(hand.cards) == 10:
+                hand = PlayerHand()
+    return run, num_cards, 'cards'
+
+
+def calculate_score(num_cards):
+    rng = random.Random(0)
+    hands = []
+    for i in range(num_cards // 4):
+        hand = PlayerHand()
+        hand.add_card(*rng.sample(Card.CARDS, 4))
+        hands.append(hand)
+
+    def run():
+        for hand in hands:
+            Blackjack.calculate_score(hand)
+    return run, len(hands), 'hands'
+
+
+def _play(num_rounds, logging):
+    # A large shoe and wallet so every round is played.
+    game = Blackjack(10 ** 12, logging=logging,
+                     deck=Shoe(8, penetration=0.75))
+    game.summary = MemorySink()
+    game.play_round(num_rounds, 17)
+    return game.summary.records
+
+
+def play_round(num_rounds, logging):
+    def run():
+        _play(num_rounds, logging)
+    return run, num_rounds, 'rounds'
+
+
+def write_summary(num_rounds):
+    """
+    Writes the summary records of `num_rounds` rounds to a file, which is
+    removed after each call. The directory goes away with the case.
+    """
+    records = _play(num_rounds, False)
+    directory = tempfile.TemporaryDirectory()
+    filename = os.path.join(directory.name, 'game_summary.txt')
+
+    def run():
+        try:
+            with SummaryWriter(filename) as writer:
+                for record in records:
+                    writer.write(record)
+        finally:
+            os.remove(filename)
+    # Keeps the directory alive as long as the timed callable.
+    run.directory = directory
+    return run, num_rounds, 'rounds'
+
+
+def all_cases(quick=False):
+    """
+    Returns (name, params, factory) for every benchmark. With `quick`, the
+    largest sizes are left out.
+    """
+    sizes = DECK_SIZES[:2] if quick else DECK_SIZES
+    rounds = ROUND_COUNTS[:3] if quick else ROUND_COUNTS
+    cases = []
+    for name, factory in [('shuffle_mongean', shuffle_mongean),
+                          ('shuffle_overhand', shuffle_overhand),
+                          ('deck_deal_hand', deck_deal_hand),
+                          ('calculate_score', calculate_score)]:
+        for size in sizes:
+            cases.append((name, {'num_cards': size}, factory))
+    for num_rounds in rounds:
+        for logging in [True, False]:
+            cases.append(('play_round',
+                          {'num_rounds': num_rounds, 'logging': logging},
+                          play_round))
+        cases.append(('write_summary', {'num_rounds': num_rounds},
+                      write_summary))
+    return cases
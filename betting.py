@@ -0,0 +1,210 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from counting import HI_LO
+
+
+class BetPolicy(ABC):
+    """
+    Rule for sizing the bet of each round. A policy is consulted once per
+    round, after the round is settled, with the bet, the result (1, 0 or
+    -1), the new wallet and the true count of the cards left under
+    `system` (0.0 when `system` is None).
+
+    Rules are written once on arrays, in next_bets() and initial_bets(), so
+    the same policy sizes the bets of a single Blackjack game and of every
+    table of simulation.simulate(). next_bet() and initial_bet() run the
+    rule on one table. Subclasses must define next_bets().
+
+    >>> policy = MartingalePolicy(max_bet=40)
+    >>> bets = np.array([5, 10, 40, 20])
+    >>> results = np.array([1, -1, -1, 0])
+    >>> policy.next_bets(bets, results, np.full(4, 100), 5, np.zeros(4))
+    array([ 5, 20, 40, 20])
+    >>> policy.next_bet(10, -1, 100, 5)
+    20
+    >>> FlatPolicy(10).next_bet(20, 1, 100, 5)
+    10
+    >>> BetPolicy()  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    TypeError: abstract method next_bets
+    """
+
+    system = None
+
+    def initial_bets(self, wallet, min_bet, count):
+        """
+        Returns the bet of the first round of each table.
+        """
+        return np.full(len(wallet), min_bet, dtype=np.int64)
+
+    @abstractmethod
+    def next_bets(self, bet, result, wallet, min_bet, count):
+        """
+        Returns the bet of the next round of each table.
+        """
+
+    def initial_bet(self, wallet, min_bet, count=0.0):
+        return int(self.initial_bets(np.array([wallet]), min_bet,
+                                     np.array([count]))[0])
+
+    def next_bet(self, bet, result, wallet, min_bet, count=0.0):
+        return int(self.next_bets(np.array([bet]), np.array([result]),
+                                  np.array([wallet]), min_bet,
+                                  np.array([count]))[0])
+
+
+class ProgressionPolicy(BetPolicy):
+    """
+    Raises the bet by `step` after a win and lowers it by `step` after a
+    loss, unless it is already at the minimum. The step is the minimum bet
+    by default, which is how Blackjack has always bet.
+
+    >>> policy = ProgressionPolicy()
+    >>> policy.next_bets(np.array([5, 5, 10, 15]), np.array([1, -1, -1, 0]),
+    ...                  np.full(4, 100), 5, np.zeros(4))
+    array([10,  5,  5, 15])
+
+    Losses never take the bet below the minimum bet:
+    >>> policy = ProgressionPolicy(step=20)
+    >>> policy.next_bets(np.array([10, 45, 30]), np.array([-1, -1, 1]),
+    ...                  np.full(3, 100), 5, np.zeros(3))
+    array([ 5, 25, 50])
+    >>> policy.next_bet(10, -1, 100, 5)
+    5
+    >>> ProgressionPolicy(10).next_bet(10, -1, 100, 5)
+    5
+    """
+
+    def __init__(self, step=None):
+        assert step is None or (type(step) == int and step > 0)
+        self.step = step
+
+    def next_bets(self, bet, result, wallet, min_bet, count):
+        step = min_bet if self.step is None else self.step
+        bet = np.where(result == 1, bet + step, bet)
+        return np.where(result == -1, np.maximum(bet - step, min_bet), bet)
+
+    def next_bet(self, bet, result, wallet, min_bet, count=0.0):
+        # Played every round of a game, so it skips the arrays.
+        step = min_bet if self.step is None else self.step
+        if result == 1:
+            bet = bet + step
+        if result == -1:
+            bet = max(bet - step, min_bet)
+        return bet
+
+
+class FlatPolicy(BetPolicy):
+    """
+    Bets `amount` (the minimum bet by default) every round.
+    """
+
+    def __init__(self, amount=None):
+        assert amount is None or (type(amount) == int and amount > 0)
+        self.amount = amount
+
+    def initial_bets(self, wallet, min_bet, count):
+        amount = min_bet if self.amount is None else self.amount
+        return np.full(len(wallet), amount, dtype=np.int64)
+
+    def next_bets(self, bet, result, wallet, min_bet, count):
+        return self.initial_bets(wallet, min_bet, count)
+
+
+class MartingalePolicy(BetPolicy):
+    """
+    Doubles the bet after a loss and goes back to the minimum bet after a
+    win. Ties keep the bet. Bets are capped at `max_bet` if it is given.
+    """
+
+    def __init__(self, max_bet=None):
+        self.max_bet = max_bet
+
+    def next_bets(self, bet, result, wallet, min_bet, count):
+        bet = np.where(result == 1, min_bet, bet)
+        bet = np.where(result == -1, 2 * bet, bet)
+        if self.max_bet is not None:
+            bet = np.minimum(bet, self.max_bet)
+        return bet
+
+
+class KellyPolicy(BetPolicy):
+    """
+    Bets a `fraction` of the Kelly stake, wallet * edge / variance, where
+    the player's edge grows with the true count:
+    edge = edge_base + edge_per_count * true count. Bets are rounded down
+    to a multiple of `unit` (the minimum bet by default) and are never less
+    than the minimum bet or more than `max_bet`.
+
+    >>> policy = KellyPolicy()
+    >>> policy.next_bets(np.full(3, 5), np.zeros(3), np.full(3, 1000), 5,
+    ...                  np.array([-2.0, 2.0, 5.0]))
+    array([ 5,  5, 15])
+    """
+
+    def __init__(self, system=HI_LO, edge_base=-0.005, edge_per_count=0.005,
+                 variance=1.3, fraction=1.0, unit=None, max_bet=None):
+        assert variance > 0 and 0 < fraction <= 1
+        self.system = system
+        self.edge_base = edge_base
+        self.edge_per_count = edge_per_count
+        self.variance = variance
+        self.fraction = fraction
+        self.unit = unit
+        self.max_bet = max_bet
+
+    def initial_bets(self, wallet, min_bet, count):
+        unit = min_bet if self.unit is None else self.unit
+        edge = self.edge_base + self.edge_per_count * np.asarray(count)
+        stake = self.fraction * wallet * np.maximum(edge, 0) / self.variance
+        bet = np.floor(stake / unit).astype(np.int64) * unit
+        bet = np.maximum(bet, min_bet)
+        if self.max_bet is not None:
+            bet = np.minimum(bet, self.max_bet)
+        return bet
+
+    def next_bets(self, bet, result, wallet, min_bet, count):
+        return self.initial_bets(wallet, min_bet, count)
+
+
+class TablePolicy(BetPolicy):
+    """
+    Custom progression through a table of bet levels. `bets` holds the bet
+    of each level and `next_level[level]` the level to move to after a
+    loss, a tie and a win, in that order. Games start at level 0, and a
+    bet that is not in the table counts as level 0.
+
+    >>> policy = TablePolicy.ladder([5, 15, 10, 30])
+    >>> policy.next_bets(np.array([5, 15, 30, 10, 7]),
+    ...                  np.array([1, -1, 1, 0, 1]), np.full(5, 100), 5,
+    ...                  np.zeros(5))
+    array([15,  5,  5, 10, 15])
+    """
+
+    def __init__(self, bets, next_level):
+        bets = np.array(bets, dtype=np.int64)
+        next_level = np.array(next_level, dtype=np.int64)
+        assert len(np.unique(bets)) == len(bets)
+        assert next_level.shape == (len(bets), 3)
+        assert ((next_level >= 0) & (next_level < len(bets))).all()
+        self.bets = bets
+        self.next_level = next_level
+
+    @classmethod
+    def ladder(cls, bets):
+        """
+        Returns the table moving one level up after a win, back to the
+        first level after a loss or after a win on the last level, and
+        staying after a tie, such as the 1-3-2-6 system.
+        """
+        n = len(bets)
+        return cls(bets, [[0, i, (i + 1) % n] for i in range(n)])
+
+    def initial_bets(self, wallet, min_bet, count):
+        return np.full(len(wallet), self.bets[0], dtype=np.int64)
+
+    def next_bets(self, bet, result, wallet, min_bet, count):
+        level = np.argmax(np.asarray(bet)[:, None] == self.bets[None, :],
+                          axis=1)
+        return self.bets[self.next_level[level, np.asarray(result) + 1]]
@@ -0,0 +1,265 @@
+import numpy as np
+from os.path import exists, getsize
+from card import Card
+
+MAGIC = b'BJSUM02\n'
+# The magic is followed by the number of card slots of a hand in each
+# record, which is MAX_CARDS unless a file had to be widened.
+WIDTH_DTYPE = np.dtype('<u4')
+HEADER_SIZE = len(MAGIC) + WIDTH_DTYPE.itemsize
+# Card slots of a hand. A player standing at 22 or less holds at most 21
+# cards and a dealer at most 17. Unused slots hold EMPTY.
+MAX_CARDS = 24
+EMPTY = 255
+
+
+def record_dtype(max_cards=MAX_CARDS):
+    """
+    Returns the dtype of the fixed-width record of a round with room for
+    `max_cards` cards in each hand. Wallet and bet are the values after the
+    round was settled.
+
+    >>> record_dtype().itemsize, record_dtype(52).itemsize
+    (77, 133)
+    """
+    return np.dtype([
+        ('round', '<u4'),
+        ('player_count', '<u2'),
+        ('dealer_count', '<u2'),
+        ('player_score', '<u2'),
+        ('dealer_score', '<u2'),
+        ('result', 'i1'),
+        ('player_cards', 'u1', (max_cards,)),
+        ('dealer_cards', 'u1', (max_cards,)),
+        ('wallet', '<i8'),
+        ('bet', '<i8'),
+    ])
+
+
+RECORD_DTYPE = record_dtype()
+
+
+def _read_width(filename):
+    with open(filename, 'rb') as f:
+        assert f.read(len(MAGIC)) == MAGIC
+        return int(np.frombuffer(f.read(WIDTH_DTYPE.itemsize),
+                                 dtype=WIDTH_DTYPE)[0])
+
+
+def _widen_records(records, max_cards):
+    widened = np.zeros(len(records), dtype=record_dtype(max_cards))
+    for name in records.dtype.names:
+        if name.endswith('_cards'):
+            widened[name] = EMPTY
+            widened[name][:, :records.dtype[name].shape[0]] = records[name]
+        else:
+            widened[name] = records[name]
+    return widened
+
+
+class BinarySummaryWriter:
+    """
+    Summary sink writing one record per round to a binary file, buffered
+    like SummaryWriter. Each hand has room for `max_cards` cards, and
+    widen() makes room for longer hands. A file that already has records
+    keeps the width it was written with.
+
+    >>> import os, tempfile
+    >>> from hand import PlayerHand, DealerHand
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'game.bin')
+    >>> player, dealer = PlayerHand(), DealerHand()
+    >>> player.add_card(Card(10, "spades"), Card("A", "spades"))
+    >>> dealer.add_card(Card("Q", "spades"), Card(7, "hearts"))
+    >>> dealer.reveal_hand()
+    >>> with BinarySummaryWriter(filename) as writer:
+    ...     writer.write_round(1, player, dealer, 1, 15, 10)
+    >>> records = read_records(filename)
+    >>> records['round'].tolist(), records['wallet'].tolist()
+    ([1], [15])
+    >>> text = to_text(records)
+    >>> print(text)
+    ROUND 1:
+    Player Hand:
+    ____
+    |10  |
+    | ♠ |
+    |__10|
+    ____
+    |A  |
+    | ♠ |
+    |__A|
+    Dealer Hand:
+    ____
+    |7  |
+    | ♥ |
+    |__7|
+    ____
+    |Q  |
+    | ♠ |
+    |__Q|
+    Winner of ROUND 1: Player
+    <BLANKLINE>
+
+    Hands longer than MAX_CARDS fit when the width is the deck size:
+    >>> from deck import Deck
+    >>> long_hand = PlayerHand()
+    >>> long_hand.add_card(*Deck().get_cards()[:30])
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'game.bin')
+    >>> with BinarySummaryWriter(filename, max_cards=52) as writer:
+    ...     writer.write_round(1, long_hand, dealer, -1, 5, 5)
+    >>> records = read_records(filename)
+    >>> int(records['player_count'][0]), int(records['player_score'][0])
+    (30, 158)
+    >>> to_text(records).count('Player Hand:')
+    1
+    """
+
+    def __init__(self, filename, flush_every=None, max_cards=MAX_CARDS):
+        assert flush_every is None or (type(flush_every) == int
+                                       and flush_every > 0)
+        assert type(max_cards) == int and max_cards > 0
+        self.filename = filename
+        self.flush_every = flush_every
+        self.file = None
+        self.new_file = not exists(filename) or getsize(filename) == 0
+        if not self.new_file:
+            max_cards = _read_width(filename)
+        self.max_cards = max_cards
+        self.buffer = np.zeros(flush_every or 64,
+                               dtype=record_dtype(max_cards))
+        self.count = 0
+
+    def write_round(self, round_played, player_hand, dealer_hand, result,
+                    wallet, bet):
+        """
+        Adds the record of a round, flushing the buffer if it is full.
+        """
+        most = max(len(player_hand.cards), len(dealer_hand.cards))
+        if most > self.max_cards:
+            raise ValueError('a hand of ' + str(most) + ' cards does not fit '
+                             + str(self.max_cards) + ' card slots')
+        if self.count == len(self.buffer):
+            if self.flush_every is None:
+                self.buffer = np.resize(self.buffer, 2 * len(self.buffer))
+            else:
+                self.flush()
+        record = self.buffer[self.count]
+        record['round'] = round_played
+        record['player_count'] = len(player_hand.cards)
+        record['dealer_count'] = len(dealer_hand.cards)
+        record['player_score'] = player_hand.score()
+        record['dealer_score'] = dealer_hand.score()
+        record['result'] = result
+        record['player_cards'] = EMPTY
+        record['player_cards'][:len(player_hand.cards)] = \
+            [i.code for i in player_hand.cards]
+        record['dealer_cards'] = EMPTY
+        record['dealer_cards'][:len(dealer_hand.cards)] = \
+            [i.code for i in dealer_hand.cards]
+        record['wallet'] = wallet
+        record['bet'] = bet
+        self.count = self.count + 1
+        if self.flush_every is not None and self.count >= self.flush_every:
+            self.flush()
+
+    def widen(self, max_cards):
+        """
+        Gives each hand room for `max_cards` cards, rewriting the records
+        already in the file at the new width.
+        """
+        if max_cards <= self.max_cards:
+            return
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if not self.new_file:
+            records = np.fromfile(self.filename, dtype=self.buffer.dtype,
+                                  offset=HEADER_SIZE)
+            with open(self.filename, 'wb') as f:
+                f.write(MAGIC)
+                f.write(np.array([max_cards], dtype=WIDTH_DTYPE).tobytes())
+                f.write(_widen_records(records, max_cards).tobytes())
+        self.buffer = _widen_records(self.buffer, max_cards)
+        self.max_cards = max_cards
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        if self.count == 0:
+            return
+        if self.file is None:
+            self.file = open(self.filename, 'ab')
+            if self.new_file:
+                self.file.write(MAGIC)
+                self.file.write(np.array([self.max_cards],
+                                         dtype=WIDTH_DTYPE).tobytes())
+                self.new_file = False
+        self.file.write(self.buffer[:self.count].tobytes())
+        self.file.flush()
+        self.count = 0
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_records(filename):
+    """
+    Returns the records of a binary summary as a read-only memory-mapped
+    array of record_dtype() with the width stored in the file.
+    """
+    dtype = record_dtype(_read_width(filename))
+    if getsize(filename) == HEADER_SIZE:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode='r', offset=HEADER_SIZE)
+
+
+def size_through(filename, round_played):
+    """
+    Returns the size the binary summary `filename` had after the record of
+    round `round_played`, at the width the file has now.
+    """
+    records = read_records(filename)
+    count = int(np.count_nonzero(records['round'] <= round_played))
+    size = HEADER_SIZE + count * records.dtype.itemsize
+    del records
+    return size
+
+
+def _hand_text(codes, count):
+    return '\n'.join([Card.CARDS[i].art for i in codes[:count]])
+
+
+def to_text(records):
+    """
+    Returns the game_summaryX.txt text of `records`.
+    """
+    winners = {1: 'Player', -1: 'Dealer', 0: 'Tied'}
+    texts = []
+    for record in records:
+        round_played = str(int(record['round']))
+        texts.append(''.join([
+            'ROUND ', round_played, ':\nPlayer Hand:\n',
+            _hand_text(record['player_cards'], record['player_count']),
+            '\nDealer Hand:\n',
+            _hand_text(record['dealer_cards'], record['dealer_count']),
+            '\nWinner of ROUND ', round_played, ': ',
+            winners[int(record['result'])], '\n']))
+    return '\n'.join(texts)
+
+
+def export_text(binary_filename, text_filename):
+    """
+    Writes the text summary of a binary summary file.
+    """
+    with open(text_filename, 'w', encoding='utf-8') as f:
+        f.write(to_text(read_records(binary_filename)))
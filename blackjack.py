@@ -1,11 +1,92 @@
 from deck import Deck
 from hand import DealerHand, PlayerHand
 from card import Card
+from summary_writer import SummaryWriter
+from binary_summary import BinarySummaryWriter
+from game_log import GameLog
+from dealer_odds import value_index
+from profiling import Profiler, enabled_by_env
+from betting import ProgressionPolicy
+from session_stats import SessionStats
+import checkpoint
+import numpy.random
 
 # don't change these imports
 from numpy.random import randint, seed
 seed(20)
 
+# Points of each card code with aces counted as 1, for headless rounds.
+_HARD = [1 if i.rank == 'A' else i.points for i in Card.CARDS]
+
+
+class _ShuffleDraws:
+    """
+    Draws the (mongean, modified overhand) counts of headless rounds.
+
+    For long runs the counts are drawn from numpy's RandomState in blocks,
+    which gives the same numbers as one randint call per count. close()
+    winds the generator back to where one call per count would have left
+    it, so the game continues the same way afterwards. A game without its
+    own generator draws through the numpy.random module functions.
+
+    Headless games rely on this, so it is checked for the global generator
+    and for RandomState on each bit generator:
+    >>> from numpy.random import MT19937, PCG64, Philox, RandomState
+    >>> def draws(rng, n):
+    ...     return [rng.randint(0, 5) for i in range(n)]
+    >>> same = []
+    >>> for make in [MT19937, PCG64, Philox, None]:
+    ...     rngs = [numpy.random if make is None else RandomState(make(3))
+    ...             for i in range(2)]
+    ...     if make is None:
+    ...         numpy.random.seed(3)
+    ...         expected = draws(numpy.random, 3000 + 10)
+    ...         numpy.random.seed(3)
+    ...     else:
+    ...         expected = draws(rngs[0], 3000 + 10)
+    ...     bulk = _ShuffleDraws(rngs[1], 1500)
+    ...     got = []
+    ...     for i in range(1500):
+    ...         got.extend(bulk.next())
+    ...     bulk.close()
+    ...     same.append(got + draws(rngs[1], 10) == expected)
+    >>> same
+    [True, True, True, True]
+    """
+
+    block = 1024
+    min_rounds = 32
+
+    def __init__(self, rng, num_rounds):
+        if rng is None:
+            rng = numpy.random
+        self.rng = rng
+        self.bulk = num_rounds >= _ShuffleDraws.min_rounds and \
+            hasattr(rng, 'get_state')
+        self.values = []
+        self.used = 0
+        self.state = None
+
+    def next(self):
+        if not self.bulk:
+            return self.rng.randint(0, 5), self.rng.randint(0, 5)
+        if self.used == len(self.values):
+            self.state = self.rng.get_state(legacy=False)
+            self.values = self.rng.randint(
+                0, 5, size=2 * _ShuffleDraws.block).tolist()
+            self.used = 0
+        self.used = self.used + 2
+        return self.values[self.used - 2], self.values[self.used - 1]
+
+    def close(self):
+        if self.bulk and self.used < len(self.values):
+            self.rng.set_state(self.state)
+            if self.used > 0:
+                self.rng.randint(0, 5, size=self.used)
+            self.values = []
+            self.used = 0
+
+
 class Blackjack:
     """
     Game of blackjack!
@@ -171,22 +252,171 @@ class Blackjack:
     >>> blackjack_4.play_round(1, 17)
     >>> print(blackjack_4.get_log())
     Not enough cards for a game.
+
+    >>> headless = Blackjack(10, logging=False)
+    >>> headless.determine_winner(21, 17)
+    1
+    >>> headless.get_log()
+    ''
+
+    >>> from shoe import Shoe
+    >>> Blackjack(10, logging=False, deck=Shoe(8)).deck.remaining()
+    416
+
+    >>> from strategy import BasicStrategy
+    >>> player = Blackjack(10, logging=False, strategy=BasicStrategy())
+    >>> player.deck.cards = [Card(10, "spades"), Card(6, "spades"),
+    ...                      Card(7, "hearts")]
+    >>> hand = PlayerHand()
+    >>> player.deck.deal_many(hand, 2)
+    >>> player.hit_or_stand(hand, 21, player.strategy, Card(6, "clubs"))
+    >>> Blackjack.calculate_score(hand)
+    16
+    >>> player.hit_or_stand(hand, 21, player.strategy, Card("K", "clubs"))
+    >>> Blackjack.calculate_score(hand)
+    23
+
+    >>> profiled = Blackjack(10, logging=False, profile=True)
+    >>> profiled.determine_winner(21, 17)
+    1
+    >>> profiled.get_stats()['determine_winner']['calls']
+    1
+    >>> headless.get_stats()
+    {}
+
+    >>> fast = Blackjack(100, headless=True)
+    >>> seed(5)
+    >>> fast.play_round(10, 16)
+    >>> (fast.wallet, fast.bet, fast.round_played, fast.get_log())
+    (80, 5, 9, '')
     """
     # Class Attribute(s)
 
     game_num = 0
 
-    def __init__(self, wallet):
+    def __init__(self, wallet, rng=None, flush_every=64, logging=True,
+                 deck=None, strategy=None, profile=None, headless=False,
+                 binary_summary=False, bet_policy=None,
+                 checkpoint_every=None):
         # Initialize instance attributes
         # auto-increment as needed
-        self.deck = Deck()
+        # `rng` is any generator with a `randint(low, high)` method, such as
+        # numpy's RandomState. Without one, the module-level randint is used.
+        # `deck` can be any Deck, such as a multi-deck Shoe.
+        # `strategy` is a strategy.Strategy that makes the player's hit or
+        # stand decisions. Without one the player stands at the
+        # `stand_threshold` given to play_round().
+        # A `headless` game plays the same rounds without logging, rendering
+        # or writing a summary, for simulations that only need the wallet.
+        # `bet_policy` is a betting.BetPolicy that sizes the bet of each
+        # round. Without one the bet goes up by the minimum bet after a win
+        # and down by it after a loss.
+        self.rng = rng
+        self.headless = headless
+        if headless:
+            logging = False
+        self.strategy = strategy
+        if bet_policy is None:
+            bet_policy = ProgressionPolicy()
+        self.bet_policy = bet_policy
+        if deck is None:
+            deck = Deck()
+        self.deck = deck
         self.wallet = wallet
         Blackjack.game_num = Blackjack.game_num + 1
         self.game_number = Blackjack.game_num
-        self.log = ''
+        # Events are kept in a GameLog and only turned into text by
+        # get_log(). With `logging` off nothing is recorded.
+        self.log = GameLog(logging)
+        # Statistics of every round settled by determine_winner(), kept in
+        # constant memory whatever the logging settings.
+        self.session_stats = SessionStats()
         self.bet = 5
         self.round_played = 0
-    
+        # The summary file is opened on the first round written to it.
+        # Records are flushed every `flush_every` rounds and at the end of
+        # each play_round() call. With `binary_summary`, rounds are written
+        # as fixed-width records to game_summaryX.bin instead. Any object
+        # with write(), flush() and close() can be set as `summary` before
+        # the first round to receive the text records.
+        self.flush_every = flush_every
+        self.binary_summary = binary_summary
+        self.summary = None
+        # With `profile` on (or BLACKJACK_PROFILE set in the environment),
+        # the hot-path methods of this game and its deck are timed. When it
+        # is off nothing is wrapped.
+        if profile is None:
+            profile = enabled_by_env()
+        self.profiler = None
+        if profile:
+            self.profiler = Profiler()
+            self.profiler.instrument(self, ['calculate_score', 'hit_or_stand',
+                                            'determine_winner', 'add_to_file'])
+            self.profiler.instrument(self.deck, ['shuffle', 'deal_hand'])
+        # With `checkpoint_every`, the state of the game is added to
+        # game_summaries/game_checkpointX.jsonl at the start of every
+        # play_round() call and after every `checkpoint_every` rounds.
+        # Headless games then play round by round so the generator state
+        # is exact at each checkpoint.
+        assert checkpoint_every is None or (type(checkpoint_every) == int
+                                            and checkpoint_every > 0)
+        self.checkpoint_every = checkpoint_every
+
+    @classmethod
+    def from_checkpoint(cls, state, truncate_summary=False,
+                        private_rng=False, **kwargs):
+        """
+        Returns a new game restored from a checkpoint.take_checkpoint()
+        state, which continues exactly as the saved game would have with
+        resume_round(). Other arguments are passed to Blackjack(); the
+        strategy and bet policy are not saved and should be given again.
+        With `truncate_summary`, summary rounds written after the
+        checkpoint are removed. A game that used numpy's global generator
+        has it set back, unless `private_rng` is on, in which case the game
+        gets its own generator in that state.
+
+        >>> from summary_writer import SummaryDirectory
+        >>> summaries = SummaryDirectory()
+        >>> from numpy.random import MT19937, RandomState
+        >>> from shoe import Shoe
+        >>> game = Blackjack(200, rng=RandomState(MT19937(3)), deck=Shoe(2),
+        ...                  checkpoint_every=4)
+        >>> game.play_round(30, 16)
+        >>> game.close()
+        >>> states = checkpoint.read_checkpoints(game.checkpoint_filename())
+        >>> [i['round'] for i in states]
+        [0, 4, 8, 12, 16, 20, 24, 28]
+        >>> with open(game.summary_filename(), encoding='utf-8') as f:
+        ...     summary = f.read()
+
+        A new game picks up from round 12 and plays the rest the same way:
+        >>> resumed = Blackjack.from_checkpoint(states[3],
+        ...                                     truncate_summary=True)
+        >>> resumed.resume_round(game.round_played - 12, 16)
+        >>> resumed.close()
+        >>> with open(game.summary_filename(), encoding='utf-8') as f:
+        ...     f.read() == summary
+        True
+        >>> resumed.wallet == game.wallet, resumed.bet == game.bet
+        (True, True)
+        >>> resumed.rng.get_state()[2] == game.rng.get_state()[2]
+        True
+        >>> resumed.session_stats == game.session_stats
+        True
+        >>> Blackjack.game_num = 0
+        >>> restored = Blackjack.from_checkpoint(states[3])
+        >>> Blackjack(10).game_number == restored.game_number + 1
+        True
+        >>> summaries.close()
+        """
+        rng = checkpoint.restore_rng(state, private_rng)
+        game = cls(state['wallet'], rng=rng,
+                   deck=checkpoint.restore_deck(state), **kwargs)
+        checkpoint.restore_game(game, state, truncate_summary)
+        # New games must not take the restored game's number and files.
+        Blackjack.game_num = max(Blackjack.game_num, game.game_number)
+        return game
+
     def play_round(self, num_rounds, stand_threshold):
         """
         Plays `num_rounds` Blackjack rounds.
@@ -201,63 +431,191 @@ class Blackjack:
         assert type(num_rounds) == int and num_rounds > 0
         assert type(stand_threshold) == int and stand_threshold > 1
         min_bet = 5
-        self.bet = min_bet
+        self.reset_bet(min_bet)
+        if self.checkpoint_every is not None:
+            self.write_checkpoint(stand_threshold, min_bet)
+        self.resume_round(num_rounds, stand_threshold)
+
+    def resume_round(self, num_rounds, stand_threshold):
+        """
+        Plays `num_rounds` more rounds like play_round(), but carrying on
+        the current bet, as after restoring a checkpoint.
+        """
+        assert type(num_rounds) == int and num_rounds > 0
+        assert type(stand_threshold) == int and stand_threshold > 1
+        min_bet = 5
+        try:
+            if self.headless and self.profiler is None and \
+                    self.checkpoint_every is None:
+                self._play_rounds_headless(num_rounds, stand_threshold,
+                                           min_bet)
+            else:
+                self._play_rounds(num_rounds, stand_threshold, min_bet)
+        finally:
+            if self.summary is not None:
+                self.summary.flush()
+
+    def _play_rounds(self, num_rounds, stand_threshold, min_bet):
+        """
+        Plays the rounds of play_round() after its arguments are checked.
+        """
         for i in range(num_rounds):
-            card_lst = self.deck.cards
-            deck = self.deck
-            min_num = 4
-            bet = self.bet
-            wallet = self.wallet
-            if len(card_lst) < min_num:
-                text = 'Not enough cards for a game.'
-                self.log = self.log + text
-                return
-            if wallet < bet:
-                text = 'Wallet amount $' + str(wallet) + ' is less than bet amount $'\
-                + str(bet) + '.'
-                self.log = self.log + text
+            if not self.play_next_round(stand_threshold, min_bet):
                 return
-            self.round_played = self.round_played + 1
+
+    def play_next_round(self, stand_threshold, min_bet=5):
+        """
+        Plays a single round, carrying on the bet of the previous round.
+        Calling this `num_rounds` times after reset_bet(min_bet) plays the
+        same game as play_round(num_rounds, stand_threshold).
+
+        Returns:
+            False if the round could not be played (the reason is logged),
+            True otherwise.
+        """
+        deck = self.deck
+        min_num = 4
+        bet = self.bet
+        wallet = self.wallet
+        if deck.available() < min_num:
+            self.log.no_cards()
+            return False
+        if wallet < bet:
+            self.log.broke(wallet, bet)
+            return False
+        self.round_played = self.round_played + 1
+        if self.rng is None:
             num_mongean = randint(0, 5)
             num_modified = randint(0, 5)
-            deck.shuffle(modified_overhand=num_modified, mongean=num_mongean)
-            player_hand = PlayerHand()
-            dealer_hand = DealerHand()
-            n = 2
-            for j in range(n):
-                deck.deal_hand(player_hand)
-                deck.deal_hand(dealer_hand)
-            text = 'Round ' + str(self.round_played) + ' of Blackjack!\n'
-            self.log = self.log + text
-            text = 'wallet: ' + str(wallet) + '\n'
-            self.log = self.log + text
-            text = 'bet: ' + str(bet) + '\n'
-            self.log = self.log + text
-            text = 'Player Cards: ' + player_hand.__repr__() + '\n'
-            self.log = self.log + text
-            text = 'Dealer Cards: ' + dealer_hand.__repr__() + '\n'
-            self.log = self.log + text
-            self.hit_or_stand(player_hand, stand_threshold)
-            dealer_hand.reveal_hand()
-            text = 'Dealer Cards Revealed: ' + dealer_hand.__repr__() + '\n'
-            self.log = self.log + text
-            dealer_threshold = 17
-            self.hit_or_stand(dealer_hand, dealer_threshold)
-            player_score = Blackjack.calculate_score(player_hand)
-            dealer_score = Blackjack.calculate_score(dealer_hand)
-            result = self.determine_winner(player_score, dealer_score)
-            if result == 1:
-                wallet = wallet + bet
-                bet = bet + min_bet
-            if result == -1:
-                wallet = wallet - bet
-                if bet > min_bet:
-                    bet = bet - min_bet
-            self.wallet = wallet
-            self.bet = bet
+        else:
+            num_mongean = self.rng.randint(0, 5)
+            num_modified = self.rng.randint(0, 5)
+        deck.shuffle(modified_overhand=num_modified, mongean=num_mongean)
+        player_hand = PlayerHand()
+        dealer_hand = DealerHand()
+        n = 2
+        for j in range(n):
+            deck.deal_hand(player_hand)
+            deck.deal_hand(dealer_hand)
+        self.log.round_start(self.round_played, wallet, bet)
+        self.log.deal(player_hand.cards, dealer_hand.cards)
+        self.hit_or_stand(player_hand, stand_threshold, self.strategy,
+                          dealer_hand.cards[0])
+        dealer_hand.reveal_hand()
+        self.log.reveal(dealer_hand.cards)
+        dealer_threshold = 17
+        self.hit_or_stand(dealer_hand, dealer_threshold)
+        player_score = self.calculate_score(player_hand)
+        dealer_score = self.calculate_score(dealer_hand)
+        result = self.determine_winner(player_score, dealer_score)
+        if result == 1:
+            wallet = wallet + bet
+        if result == -1:
+            wallet = wallet - bet
+        self.wallet = wallet
+        self.bet = self.next_bet(bet, result, min_bet)
+        if not self.headless:
             self.add_to_file(player_hand, dealer_hand, result)
+        if self.checkpoint_every is not None and \
+                self.round_played % self.checkpoint_every == 0:
+            self.write_checkpoint(stand_threshold, min_bet)
+        return True
+
+    def _play_rounds_headless(self, num_rounds, stand_threshold, min_bet):
+        """
+        Plays the rounds of play_round() like _play_rounds(), with the same
+        random draws, deck order, wallet and bet, but without hands, log or
+        summary text. Scores are kept as a hard total and an ace count.
+        """
+        deck = self.deck
+        strategy = self.strategy
+        if strategy is not None:
+            table = strategy.table
+        draws = _ShuffleDraws(self.rng, num_rounds)
+        min_num = 4
+        dealer_threshold = 17
+        try:
+            for i in range(num_rounds):
+                bet = self.bet
+                wallet = self.wallet
+                if deck.available() < min_num or wallet < bet:
+                    return
+                self.round_played = self.round_played + 1
+                num_mongean, num_modified = draws.next()
+                deck.shuffle(modified_overhand=num_modified,
+                             mongean=num_mongean)
+                # Cards 1 and 3 go to the player, 2 and 4 to the dealer.
+                card_1 = deck.draw()
+                upcard = deck.draw()
+                card_3 = deck.draw()
+                card_4 = deck.draw()
+                p_hard = _HARD[card_1.code] + _HARD[card_3.code]
+                p_aces = (card_1.code >= 48) + (card_3.code >= 48)
+                d_hard = _HARD[upcard.code] + _HARD[card_4.code]
+                d_aces = (upcard.code >= 48) + (card_4.code >= 48)
+                if strategy is not None:
+                    up = value_index(upcard)
+                while deck.remaining() > 0:
+                    soft = p_aces > 0 and p_hard + 10 <= 21
+                    score = p_hard + 10 if soft else p_hard
+                    if strategy is None:
+                        if score >= stand_threshold:
+                            break
+                    elif not table[score, int(soft), up]:
+                        break
+                    card = deck.draw()
+                    p_hard = p_hard + _HARD[card.code]
+                    p_aces = p_aces + (card.code >= 48)
+                while deck.remaining() > 0:
+                    if d_aces > 0 and d_hard + 10 <= 21:
+                        score = d_hard + 10
+                    else:
+                        score = d_hard
+                    if score >= dealer_threshold:
+                        break
+                    card = deck.draw()
+                    d_hard = d_hard + _HARD[card.code]
+                    d_aces = d_aces + (card.code >= 48)
+                if p_aces > 0 and p_hard + 10 <= 21:
+                    p_hard = p_hard + 10
+                if d_aces > 0 and d_hard + 10 <= 21:
+                    d_hard = d_hard + 10
+                result = self.determine_winner(p_hard, d_hard)
+                if result == 1:
+                    wallet = wallet + bet
+                if result == -1:
+                    wallet = wallet - bet
+                self.wallet = wallet
+                self.bet = self.next_bet(bet, result, min_bet)
+        finally:
+            draws.close()
 
-            
+    def reset_bet(self, min_bet=5):
+        """
+        Sets the bet of the first round of a play_round() call.
+        """
+        self.bet = self.bet_policy.initial_bet(self.wallet, min_bet,
+                                               self.true_count())
+
+    def next_bet(self, bet, result, min_bet=5):
+        """
+        Returns the bet after a round with `result` (1, 0 or -1) was played
+        for `bet` and settled into the wallet.
+        """
+        return self.bet_policy.next_bet(bet, result, self.wallet, min_bet,
+                                        self.true_count())
+
+    def true_count(self):
+        """
+        Returns the true count of the deck under the bet policy's tag
+        system, or 0.0 if the policy does not count cards.
+        """
+        system = self.bet_policy.system
+        if system is None:
+            return 0.0
+        return self.deck.true_count(system)
+
+    @staticmethod
     def calculate_score(hand):
         """
         Calculates the score of a given hand. 
@@ -267,8 +625,8 @@ class Blackjack:
         Ace card is dependent on which value would bring the score closer
         (but not over) 21. 
 
-        Should be solved using list comprehension and map/filter. No explicit
-        for loops.
+        The hand keeps a running total as cards are added, so this only
+        reads it.
 
         Parameters:
             hand: The hand to calculate the score of.
@@ -276,36 +634,14 @@ class Blackjack:
             The best score as an integer value.
         """
         assert type(hand) == PlayerHand or type(hand) == DealerHand
-        max_value = 21
-        half_value = 11
-        ace_value = 10
-        card_lst = hand.cards
-        num_lst = [i.rank for i in card_lst]
-        num_lst = list(map(lambda x: ace_value if x == 'J' or x == 'Q' or x == 'K' else x, num_lst))
-        ace_lst = list(filter(lambda x: x == 'A', num_lst))
-        num_lst = list(filter(lambda x: x != 'A', num_lst))
-        total_1 = sum(num_lst)
-        if total_1 >= max_value:
-            total_2 = len(ace_lst)
-        else:
-            if total_1 >= half_value:
-                total_2 = len(ace_lst)
-            else:
-                if len(ace_lst) >= 1:
-                    if total_1 + half_value + len(ace_lst) -1 > max_value:
-                        total_2 = len(ace_lst)
-                    else:
-                        total_2 = half_value + len(ace_lst) - 1
-                else:
-                    total_2 = 0
-        total = total_1 + total_2
-        return total
+        return hand.score()
 
     def determine_winner(self, player_score, dealer_score):
         """
         Determine whether the Blackjack round ended with a tie, dealer winning, 
         or player winning. Update the log to include the winner and
-        their scores before returning.
+        their scores before returning, and add the round, played for the
+        current bet, to the session statistics.
 
         Returns:
             1 if the player won, 0 if it is a tie, and -1 if the dealer won
@@ -324,18 +660,11 @@ class Blackjack:
                 result = 1
         if player_score <= max_value and dealer_score > max_value:
             result = 1
-        if result == 1:
-            text = 'Player won with a score of ' + str(player_score) +\
-            '. Dealer lost with a score of ' + str(dealer_score) + '.\n'
-        if result == -1:
-            text = 'Player lost with a score of ' + str(player_score) +\
-            '. Dealer won with a score of ' + str(dealer_score) + '.\n'
-        if result == 0:
-            text = 'Player and Dealer tie.\n'
-        self.log = self.log + text
+        self.log.outcome(player_score, dealer_score, result)
+        self.session_stats.record(player_score, dealer_score, result, self.bet)
         return result
 
-    def hit_or_stand(self, hand, stand_threshold):
+    def hit_or_stand(self, hand, stand_threshold, strategy=None, upcard=None):
         """
         Deals cards to hand until the hand score has reached or surpassed
         the `stand_threshold`. Updates the log everytime a card is pulled.
@@ -345,29 +674,45 @@ class Blackjack:
             stand_threshold: Score threshold for when the player
             will stand (ie player stands if they have a score >= 
             this threshold).
+            strategy: if given, a strategy.Strategy whose table decides
+            when to stand instead of `stand_threshold`.
+            upcard: the dealer's face-up card, used with `strategy`.
         """
+        deck = self.deck
+        card_lst = deck.get_cards()
+        if strategy is not None:
+            table = strategy.table
+            up = value_index(upcard)
         while 1:
-            score = Blackjack.calculate_score(hand)
-            deck = self.deck
-            card_lst = deck.cards
-            if score >= stand_threshold:
+            score = self.calculate_score(hand)
+            if strategy is None:
+                if score >= stand_threshold:
+                    return
+            elif not table[score, int(hand.is_soft()), up]:
                 return
-            if len(card_lst) == 0:
+            if deck.remaining() == 0:
                 return
             top = card_lst[0]
             deck.deal_hand(hand)
             if type(hand) == PlayerHand:
-                text = top.__repr__() + ' was pulled by a Player\n'
+                self.log.hit(top, 'Player')
             if type(hand) == DealerHand:
-                text = top.__repr__() + ' was pulled by a Dealer\n'
-            self.log = self.log + text
-            self.deck = deck
+                self.log.hit(top, 'Dealer')
+
+    def get_stats(self):
+        """
+        Returns the call counts and times of the profiled methods, or an
+        empty dictionary when profiling is off.
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.get_stats()
 
     def get_log(self):
-        return self.log
+        return self.log.render()
     
     def reset_log(self):
-        self.log = ''
+        self.log.clear()
         
         
     def add_to_file(self, player_hand, dealer_hand, result):
@@ -379,26 +724,59 @@ class Blackjack:
         """
         
         # Remember to use encoding = "utf-8" 
-        filename = 'game_summaries/game_summary' + str(self.game_number) + '.txt'
-        file = open(filename, 'a', encoding = 'utf-8')
-        file_read = open(filename, 'r', encoding = 'utf-8')
-        l = file_read.readlines()
-        if len(l) == 0:
-            text = ''
-        else:
-            text = '\n'
-        file_read.close()
-        text = text + 'ROUND ' + str(self.round_played) + ':\n'
-        text = text + 'Player Hand:\n'
-        text = text + player_hand.__str__() + '\n'
-        text = text + 'Dealer Hand:\n'
-        text = text + dealer_hand.__str__() + '\n'
+        if self.binary_summary:
+            if self.summary is None:
+                self.summary = BinarySummaryWriter(self.summary_filename(),
+                                                   self.flush_every)
+            if len(player_hand.cards) > self.summary.max_cards:
+                # Only thresholds above 22 deal hands this long. No hand
+                # holds more than every card of the deck.
+                self.summary.widen(sum(self.deck.full_counts()))
+            self.summary.write_round(self.round_played, player_hand,
+                                     dealer_hand, result, self.wallet, self.bet)
+            return
+        if self.summary is None:
+            self.summary = SummaryWriter(self.summary_filename(),
+                                         self.flush_every)
         if result == 1:
             winner = 'Player'
         if result == -1:
             winner = 'Dealer'
         if result == 0:
             winner = 'Tied'
-        text = text + 'Winner of ROUND ' + str(self.round_played) + ': ' + winner + '\n'
-        file.write(text)
-        file.close()
+        round_played = str(self.round_played)
+        text = ''.join(['ROUND ', round_played, ':\nPlayer Hand:\n',
+                        player_hand.__str__(), '\nDealer Hand:\n',
+                        dealer_hand.__str__(), '\nWinner of ROUND ',
+                        round_played, ': ', winner, '\n'])
+        self.summary.write(text)
+
+    def summary_filename(self):
+        extension = '.bin' if self.binary_summary else '.txt'
+        return 'game_summaries/game_summary' + str(self.game_number) \
+            + extension
+
+    def checkpoint_filename(self):
+        return 'game_summaries/game_checkpoint' + str(self.game_number) \
+            + '.jsonl'
+
+    def write_checkpoint(self, stand_threshold, min_bet=5):
+        """
+        Adds the current state of the game to its checkpoint file.
+        """
+        checkpoint.append_checkpoint(
+            self.checkpoint_filename(),
+            checkpoint.take_checkpoint(self, stand_threshold, min_bet))
+
+    def close(self):
+        """
+        Writes any buffered summary records and closes the summary file.
+        """
+        if self.summary is not None:
+            self.summary.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
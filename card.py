@@ -1,7 +1,20 @@
+RANKS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K', 'A']
+SUITS = ['spades', 'hearts', 'diamonds', 'clubs']
+GLYPHS = ['♠', '♥', '♦', '♣']
+
+HIDDEN_STR = '____\n|?  |\n| ? |\n|__?|'
+HIDDEN_REPR = '(?, ?)'
+
+
 class Card:
     """
     Card class.
 
+    Each card is encoded as a small integer `code` (0-51) equal to
+    4 * rank index + suit index, so the codes follow the ascending order of
+    a new deck. The 52 cards are created once and shared: building a card
+    with the same rank and suit always returns the same immutable object.
+
     # Doctests for str and repr
     >>> card_1 = Card("A", "spades")
     >>> print(card_1)
@@ -36,135 +49,110 @@ class Card:
     >>> card_3 > card_1
     True
 
-    # Doctests for set_visible()
-    >>> card_3.set_visible(False)
-    >>> print(card_3)
-    ____
-    |?  |
-    | ? |
-    |__?|
-    >>> card_3
-    (?, ?)
-    >>> card_3.set_visible(True)
-    >>> print(card_3)
-    ____
-    |A  |
-    | ♦ |
-    |__A|
-    >>> card_3
+    # Doctests for the integer encoding
+    >>> Card("A", "spades") is card_1
+    True
+    >>> card_1.code, card_1.x, card_1.points
+    (48, 14, 11)
+    >>> Card.from_code(50)
     (A, diamonds)
+    >>> card_1.rank = 2
+    Traceback (most recent call last):
+    ...
+    AttributeError: Card is immutable
     """
 
     # Class Attribute(s)
 
-    def __init__(self, rank, suit, visible=True):
+    __slots__ = ('code', 'rank', 'suit', 'x', 'c', 'points', 'art', 'label')
+
+    CARDS = []
+    _lookup = {}
+
+    def __new__(cls, rank, suit):
         """
-        Creates a card instance and asserts that the rank and suit are valid.
+        Returns the shared card instance for `rank` and `suit`, asserting
+        that the rank and suit are valid.
         """
-        rank_lst = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K', 'A']
-        suit_lst = ['spades', 'hearts', 'diamonds', 'clubs']
-        assert rank in rank_lst
-        assert suit in suit_lst
-        self.rank = rank
-        self.suit = suit
-        self.visible = visible
-        x = rank
-        c = suit
-        if rank == 'J':
-            x = 11
-        if rank == 'Q':
-            x = 12
-        if rank == 'K':
-            x = 13
+        card = cls._lookup.get((rank, suit))
+        assert card is not None
+        return card
+
+    @classmethod
+    def _build(cls, code):
+        """
+        Creates the card with the given code. Only used to fill CARDS.
+        """
+        card = object.__new__(cls)
+        rank = RANKS[code // 4]
+        suit_index = code % 4
         if rank == 'A':
-            x = 14
-        if suit == 'hearts':
-            c = '♥'
-        if suit == 'spades':
-            c = '♠'
-        if suit == 'clubs':
-            c = '♣'
-        if suit == 'diamonds':
-            c = '♦'
-        self.x = x
-        self.c = c
+            points = 11
+        elif type(rank) == str:
+            points = 10
+        else:
+            points = rank
+        set_attr = object.__setattr__
+        set_attr(card, 'code', code)
+        set_attr(card, 'rank', rank)
+        set_attr(card, 'suit', SUITS[suit_index])
+        set_attr(card, 'x', code // 4 + 2)
+        set_attr(card, 'c', GLYPHS[suit_index])
+        set_attr(card, 'points', points)
+        # The str and repr text never change, so they are built once here.
+        rank = str(rank)
+        set_attr(card, 'art', '____\n|' + rank + '  |\n| ' + card.c +
+                 ' |\n|__' + rank + '|')
+        set_attr(card, 'label', '(' + rank + ', ' + card.suit + ')')
+        return card
 
-    def __lt__(self, other_card):
-        rank1 = self.x
-        rank2 = other_card.x
-        suit1 = self.suit
-        suit2 = other_card.suit
-        if suit1 == 'spades':
-            suit1 = 1
-        if suit1 == 'hearts':
-            suit1 = 2
-        if suit1 == 'diamonds':
-            suit1 = 3
-        if suit1 == 'clubs':
-            suit1 = 4
-        if suit2 == 'spades':
-            suit2 = 1
-        if suit2 == 'hearts':
-            suit2 = 2
-        if suit2 == 'diamonds':
-            suit2 = 3
-        if suit2 == 'clubs':
-            suit2 = 4
-        if rank1 < rank2:
-            return True
-        if rank1 > rank2:
-            return False
-        if rank1 == rank2:
-            if suit1 < suit2:
-                return True
-            if suit1 > suit2:
-                return False
+    @classmethod
+    def from_code(cls, code):
+        """
+        Returns the card with the integer encoding `code`.
+        """
+        return cls.CARDS[code]
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Card is immutable')
 
+    def __delattr__(self, name):
+        raise AttributeError('Card is immutable')
+
+    def __reduce__(self):
+        # Unpickling goes through __new__ so the shared instance is kept.
+        return (Card, (self.rank, self.suit))
+
+    def __lt__(self, other_card):
+        # Codes order by rank first, then spades < hearts < diamonds < clubs.
+        return self.code < other_card.code
 
     def __str__(self):
         """
-        Returns ASCII art of a card with the rank and suit. If the card is
-        hidden, question marks are put in place of the actual rank and suit.
+        Returns ASCII art of a card with the rank and suit. Hidden cards are
+        drawn by the hand holding them, using HIDDEN_STR.
 
         Examples:
         ____
         |A  |
         | ♠ |
         |__A|
-        ____
-        |?  |
-        | ? |
-        |__?|             
         """
-        if self.visible == True:
-            rank = str(self.rank)
-            suit = self.c
-        if self.visible == False:
-            rank = '?'
-            suit = '?'
-        text1 = '____\n'
-        text2 = '|' + rank +'  |\n'
-        text3 = '| ' + suit + ' |\n'
-        text4 = '|__' + rank + '|'
-        text = text1 + text2 + text3 + text4
-        return text
+        return self.art
 
     def __repr__(self):
         """
-        Returns (<rank>, <suit>). If the card is hidden, question marks are
-        put in place of the actual rank and suit.           
-        """        
-        if self.visible == True:
-            return '(' + str(self.rank) + ', ' + self.suit + ')'
-        else:
-            return '(?, ?)'
+        Returns (<rank>, <suit>). Hidden cards are shown by the hand holding
+        them, using HIDDEN_REPR.
+        """
+        return self.label
 
     def get_rank(self):
         return self.rank
-    
+
     def get_suit(self):
         return self.suit
 
-    def set_visible(self, visible):
-        assert type(visible) == bool
-        self.visible = visible
\ No newline at end of file
+
+Card.CARDS = [Card._build(code) for code in range(len(RANKS) * len(SUITS))]
+Card._lookup = {(i.rank, i.suit): i for i in Card.CARDS}
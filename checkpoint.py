@@ -0,0 +1,177 @@
+import json
+from base64 import b64decode, b64encode
+from os.path import exists, getsize
+import numpy as np
+from card import Card
+import binary_summary
+from deck import Deck
+from shoe import Shoe
+from session_stats import SessionStats
+
+VERSION = 2
+
+# A checkpoint is a dictionary of plain values, written as one JSON line.
+# Cards are stored as their codes and arrays (the generator key) as
+# base64 bytes, so a checkpoint of a 52-card deck is about 3 KB.
+
+
+def _encode(value):
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return {'dtype': value.dtype.str,
+                'data': b64encode(value.tobytes()).decode('ascii')}
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if set(value) == {'dtype', 'data'}:
+            return np.frombuffer(b64decode(value['data']),
+                                 dtype=value['dtype']).copy()
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+def _encode_cards(cards):
+    return b64encode(bytes([i.code for i in cards])).decode('ascii')
+
+
+def _decode_cards(text):
+    return [Card.CARDS[i] for i in b64decode(text)]
+
+
+def take_checkpoint(game, stand_threshold, min_bet=5):
+    """
+    Returns the state of `game` between two rounds: the cards left (and
+    the discards of a Shoe), the wallet, bet, round and game numbers, the
+    generator state, the session statistics and how much of the summary
+    file has been written. The summary is flushed first.
+
+    `stand_threshold` and `min_bet` are the arguments the rounds are being
+    played with, so a replay can play on from the checkpoint.
+    """
+    deck = game.deck
+    if game.rng is None:
+        rng_state = np.random.get_state(legacy=False)
+    else:
+        rng_state = game.rng.get_state(legacy=False)
+    shoe = None
+    if isinstance(deck, Shoe):
+        # Cards dealt since the last shuffle join the discards then.
+        discards = deck._discards + deck._cards[:deck._pos]
+        shoe = {'num_decks': deck.num_decks,
+                'penetration': deck.penetration,
+                'discards': _encode_cards(discards),
+                'reshuffles': deck.reshuffles}
+    summary_size = None
+    if not game.headless:
+        if game.summary is not None:
+            game.summary.flush()
+        filename = game.summary_filename()
+        summary_size = getsize(filename) if exists(filename) else 0
+    return {
+        'version': VERSION,
+        'game_number': game.game_number,
+        'round': game.round_played,
+        'wallet': game.wallet,
+        'bet': game.bet,
+        'stand_threshold': stand_threshold,
+        'min_bet': min_bet,
+        'deck': _encode_cards(deck.get_cards()),
+        'full_counts': list(deck.full_counts()),
+        'shoe': shoe,
+        'global_rng': game.rng is None,
+        'rng': _encode(rng_state),
+        'stats': game.session_stats.snapshot(),
+        'summary_size': summary_size,
+    }
+
+
+def restore_rng(state, private=False):
+    """
+    Returns the generator saved in `state`. A game that used numpy's global
+    generator gets it set back instead, and None is returned, unless
+    `private` is on: then a new generator in that state is returned and the
+    global one is left alone.
+    """
+    rng_state = _decode(state['rng'])
+    if state['global_rng'] and not private:
+        np.random.set_state(rng_state)
+        return None
+    rng = np.random.RandomState(
+        getattr(np.random, rng_state['bit_generator'])())
+    rng.set_state(rng_state)
+    return rng
+
+
+def restore_deck(state):
+    """
+    Returns the Deck or Shoe saved in `state`, with its count.
+    """
+    shoe = state['shoe']
+    if shoe is None:
+        deck = Deck()
+    else:
+        deck = Shoe(shoe['num_decks'], shoe['penetration'])
+        deck._discards = _decode_cards(shoe['discards'])
+        deck.reshuffles = shoe['reshuffles']
+    deck.cards = _decode_cards(state['deck'])
+    deck._full = tuple(state['full_counts'])
+    return deck
+
+
+def restore_game(game, state, truncate_summary=False):
+    """
+    Sets the wallet, bet, round and game numbers and session statistics of
+    `game` from `state`. With `truncate_summary`, rounds written to the
+    summary file after the checkpoint are removed, so the game can play
+    them again.
+    """
+    assert state['version'] == VERSION
+    game.game_number = state['game_number']
+    game.round_played = state['round']
+    game.wallet = state['wallet']
+    game.bet = state['bet']
+    game.session_stats = SessionStats.from_snapshot(state['stats'])
+    size = state['summary_size']
+    if truncate_summary and size is not None:
+        filename = game.summary_filename()
+        if exists(filename) and game.binary_summary:
+            # Records are counted by round, since the file may have been
+            # widened after the checkpoint.
+            size = binary_summary.size_through(filename, state['round'])
+        if exists(filename) and getsize(filename) > size:
+            with open(filename, 'r+b') as f:
+                f.truncate(size)
+
+
+def append_checkpoint(filename, state):
+    """
+    Adds `state` to the end of a checkpoint file.
+    """
+    with open(filename, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(state, separators=(',', ':')) + '\n')
+
+
+def read_checkpoints(filename):
+    """
+    Returns the checkpoints of a file in the order they were written. A
+    last line cut short by a crash is left out.
+    """
+    with open(filename, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    states = []
+    for i in range(len(lines)):
+        if lines[i] == '':
+            continue
+        try:
+            states.append(json.loads(lines[i]))
+        except ValueError:
+            if i < len(lines) - 1:
+                raise
+    return states
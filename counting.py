@@ -0,0 +1,69 @@
+from operator import mul
+from card import RANKS
+
+# Rank histograms have one bin per rank in the order of RANKS (2 to ace),
+# so the bin of a card is card.code // 4.
+NUM_RANKS = len(RANKS)
+DECK_SIZE = 52
+
+
+class TagSystem:
+    """
+    Card-counting tag system. `tags` holds the tag of each rank in the
+    order of RANKS. The running count starts at
+    `initial_base + initial_per_deck * num_decks` and adds the tag of every
+    card dealt.
+
+    >>> from card import Card
+    >>> from deck import Deck
+    >>> from hand import PlayerHand
+    >>> deck = Deck()
+    >>> deck.cards = [Card(5, "spades"), Card("K", "hearts"),
+    ...               Card(3, "clubs"), Card(2, "hearts")] + deck.cards[8:]
+    >>> deck.deal_many(PlayerHand(), 3)
+    >>> HI_LO.running_count(deck.rank_counts(), deck.full_counts())
+    1
+    >>> KO.running_count(deck.rank_counts(), deck.full_counts())
+    1
+    >>> HI_LO.card_tag(Card("A", "spades")), KO.card_tag(Card(7, "spades"))
+    (-1, 1)
+    """
+
+    def __init__(self, name, tags, initial_base=0, initial_per_deck=0):
+        assert len(tags) == NUM_RANKS
+        self.name = name
+        self.tags = tuple(tags)
+        self.initial_base = initial_base
+        self.initial_per_deck = initial_per_deck
+        self.balanced = sum(tags) == 0
+
+    def card_tag(self, card):
+        return self.tags[card.code // 4]
+
+    def initial_count(self, num_decks):
+        return self.initial_base + self.initial_per_deck * num_decks
+
+    def running_count(self, counts, full):
+        """
+        Returns the running count after dealing a pack with rank histogram
+        `full` down to the histogram `counts`.
+        """
+        tags = self.tags
+        dealt = sum(map(mul, tags, full)) - sum(map(mul, tags, counts))
+        return self.initial_count(round(sum(full) / DECK_SIZE)) + dealt
+
+    def true_count(self, counts, full):
+        """
+        Returns the running count divided by the number of decks left to
+        deal (taken as one card when the pack is empty).
+        """
+        remaining = max(sum(counts), 1)
+        return self.running_count(counts, full) * DECK_SIZE / remaining
+
+
+HI_LO = TagSystem('Hi-Lo', [1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, -1])
+# Knock-Out is unbalanced: a full deck counts +4, so the count starts at
+# 4 - 4 * num_decks to make a neutral shoe end at +4.
+KO = TagSystem('KO', [1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1, -1],
+               initial_base=4, initial_per_deck=-4)
+HI_OPT_I = TagSystem('Hi-Opt I', [0, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, 0])
@@ -0,0 +1,142 @@
+from functools import lru_cache
+from card import Card
+
+# A deck composition is a tuple of 10 counts: index 0 holds aces, index i
+# holds cards worth i + 1 points, and index 9 holds tens and face cards.
+NUM_VALUES = 10
+DEALER_THRESHOLD = 17
+MAX_VALUE = 21
+
+# Final dealer outcomes. 'short' is a dealer who ran out of cards before
+# reaching 17, which can happen when a single deck is played down.
+OUTCOMES = (17, 18, 19, 20, 21, 'bust', 'short')
+
+# Most dealer states kept by the memo. A new composition adds about 800
+# states, so a bounded cache keeps the ones shared by nearby compositions
+# without growing over a whole shoe.
+CACHE_SIZE = 2 ** 15
+
+
+def value_index(card):
+    """
+    Returns the index of `card` in a deck composition.
+    """
+    if card.rank == 'A':
+        return 0
+    return card.points - 1
+
+
+def rank_counts(cards):
+    """
+    Returns the composition of `cards` as a tuple of 10 counts.
+
+    >>> rank_counts(Card.CARDS)
+    (4, 4, 4, 4, 4, 4, 4, 4, 4, 16)
+    """
+    counts = [0] * NUM_VALUES
+    for i in cards:
+        counts[value_index(i)] = counts[value_index(i)] + 1
+    return tuple(counts)
+
+
+def _score(hard, has_ace):
+    if has_ace and hard + 10 <= MAX_VALUE:
+        return hard + 10
+    return hard
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _final(counts, hard, has_ace):
+    """
+    Returns the probabilities of OUTCOMES for a dealer holding a hand with
+    hard total `hard` who draws from `counts`.
+    """
+    score = _score(hard, has_ace)
+    if score >= DEALER_THRESHOLD:
+        result = [0.0] * len(OUTCOMES)
+        if score > MAX_VALUE:
+            result[5] = 1.0
+        else:
+            result[score - DEALER_THRESHOLD] = 1.0
+        return tuple(result)
+    total = sum(counts)
+    if total == 0:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    result = [0.0] * len(OUTCOMES)
+    for i in range(NUM_VALUES):
+        if counts[i] == 0:
+            continue
+        weight = counts[i] / total
+        rest = counts[:i] + (counts[i] - 1,) + counts[i + 1:]
+        sub = _final(rest, hard + i + 1, has_ace or i == 0)
+        for j in range(len(OUTCOMES)):
+            result[j] = result[j] + weight * sub[j]
+    return tuple(result)
+
+
+def clear_cache():
+    """
+    Empties the memo of dealer states, for example when a new shoe starts
+    and the old compositions will not come back.
+
+    >>> d = dealer_distribution(Card(6, "hearts"))
+    >>> 0 < _final.cache_info().currsize <= CACHE_SIZE
+    True
+    >>> clear_cache()
+    >>> _final.cache_info().currsize
+    0
+    """
+    _final.cache_clear()
+
+
+def dealer_distribution(upcard, counts=None):
+    """
+    Returns the exact probability of each dealer outcome, as a dictionary
+    keyed by OUTCOMES, for a dealer showing `upcard` whose hole card and
+    hits come from `counts`. The dealer hits below 17 like in
+    `Blackjack.hit_or_stand` and hands are scored like `calculate_score`.
+
+    A composition already seen is a cache hit. A new one recurses over
+    every dealer hand, which takes milliseconds, and its states stay in
+    a cache of at most CACHE_SIZE entries.
+
+    Parameters:
+        upcard: the dealer's face-up Card.
+        counts: composition of the undealt cards (see `rank_counts`). By
+        default, a full deck without the upcard.
+
+    >>> dist = dealer_distribution(Card(6, "hearts"))
+    >>> round(dist['bust'], 4), round(sum(dist.values()), 10)
+    (0.4208, 1.0)
+    >>> dealer_distribution(Card("K", "spades"), (0,) * 10)['short']
+    1.0
+
+    Monte Carlo check with the game's own dealer rule:
+    >>> from random import Random
+    >>> from deck import Deck
+    >>> from hand import DealerHand
+    >>> from blackjack import Blackjack
+    >>> upcard = Card(6, "hearts")
+    >>> game = Blackjack(0, logging=False)
+    >>> rng = Random(1)
+    >>> busts = 0
+    >>> for i in range(20000):
+    ...     cards = [c for c in Card.CARDS if c is not upcard]
+    ...     rng.shuffle(cards)
+    ...     game.deck = Deck()
+    ...     game.deck.cards = cards
+    ...     hand = DealerHand()
+    ...     hand.add_card(upcard)
+    ...     game.deck.deal_hand(hand)
+    ...     hand.reveal_hand()
+    ...     game.hit_or_stand(hand, 17)
+    ...     busts = busts + (Blackjack.calculate_score(hand) > 21)
+    >>> abs(busts / 20000 - dist['bust']) < 0.01
+    True
+    """
+    index = value_index(upcard)
+    if counts is None:
+        counts = list(rank_counts(Card.CARDS))
+        counts[index] = counts[index] - 1
+    result = _final(tuple(counts), index + 1, index == 0)
+    return dict(zip(OUTCOMES, result))
@@ -1,6 +1,50 @@
 from card import Card
 from hand import PlayerHand, DealerHand
-from shuffle import Shuffle
+import shuffle_algebra
+from counting import NUM_RANKS, HI_LO
+from collections.abc import Sequence
+
+
+class DeckView(Sequence):
+    """
+    Read-only view of the undealt cards of a deck. Indexing and len() are
+    done against the deck's backing list, so no cards are copied.
+
+    >>> deck = Deck()
+    >>> view = deck.get_cards()
+    >>> len(view)
+    52
+    >>> deck.deal_hand(PlayerHand())
+    >>> len(view), view[0]
+    (51, (2, hearts))
+    >>> view[-1]
+    (A, clubs)
+    """
+
+    __slots__ = ('deck',)
+
+    def __init__(self, deck):
+        self.deck = deck
+
+    def __len__(self):
+        return len(self.deck._cards) - self.deck._pos
+
+    def __getitem__(self, index):
+        deck = self.deck
+        pos = deck._pos
+        if type(index) == slice:
+            return deck._cards[pos:][index]
+        if index < 0:
+            index = index + len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('deck index out of range')
+        return deck._cards[pos + index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return list(self).__repr__()
 
 class Deck:
     """
@@ -25,6 +69,21 @@ class Deck:
     (Q, spades)
     >>> hand
     (A, spades)
+
+    >>> deck.remaining()
+    51
+    >>> deck.deal_many(hand, 2)
+    >>> hand
+    (10, spades) (Q, spades) (A, spades)
+    >>> deck.get_cards()[:2]
+    [(7, hearts), (5, hearts)]
+
+    The deck keeps a histogram of the ranks left to deal, in the order of
+    card.RANKS, for card-counting queries:
+    >>> deck.rank_counts()
+    (4, 4, 4, 4, 4, 4, 4, 4, 3, 4, 3, 4, 3)
+    >>> deck.running_count(), round(deck.true_count(), 3)
+    (-3, -3.184)
     """
 
     # Class Attribute(s)
@@ -33,10 +92,34 @@ class Deck:
         """
         Creates a Deck instance containing cards sorted in ascending order.
         """
-        rank_lst = [2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K', 'A']
-        suit_lst = ['spades', 'hearts', 'diamonds', 'clubs']
-        card_lst = [Card(i, j) for i in rank_lst for j in suit_lst]
-        self.cards = card_lst
+        # Card.CARDS is already in ascending order, so a new deck only
+        # copies the shared card instances.
+        # Dealing moves `_pos` forward instead of copying `_cards`.
+        self._cards = list(Card.CARDS)
+        self._pos = 0
+        self._reset_counts()
+
+    @property
+    def cards(self):
+        return DeckView(self)
+
+    @cards.setter
+    def cards(self, card_lst):
+        # Setting the cards starts a new pack, so counting starts over.
+        self._cards = list(card_lst)
+        self._pos = 0
+        self._reset_counts()
+
+    def _reset_counts(self):
+        """
+        Rebuilds the rank histogram from the undealt cards, which become
+        the full pack the counts are taken against.
+        """
+        counts = [0] * NUM_RANKS
+        for i in self._cards[self._pos:]:
+            counts[i.code // 4] = counts[i.code // 4] + 1
+        self._counts = counts
+        self._full = tuple(counts)
 
     def shuffle(self, **shuffle_and_count):
         """Shuffles the deck using a variety of different shuffles.
@@ -46,35 +129,90 @@ class Deck:
             shuffle type and the number of times the shuffled
             should be called.
         """
-        shuffle_lst = list(shuffle_and_count.items())
-        new_lst = []
-        for i in shuffle_lst:
-            if i[0] == 'modified_overhand':
-                new_lst.append(i)
-        for i in shuffle_lst:
-            if i[0] == 'mongean':
-                new_lst.append(i)
-        for i in new_lst:
-            shuffle_type = i[0]
-            num = i[1]
-            if shuffle_type == 'modified_overhand':
-                new_card_lst = Shuffle.modified_overhand(self.cards, num)
-                self.cards = new_card_lst
-            if shuffle_type == 'mongean':
-                for j in range(num):
-                    new_card_lst = Shuffle.mongean(self.cards)
-                    self.cards = new_card_lst
+        # The overhand shuffle always runs before the Mongean shuffles, so
+        # any pair of counts is a single precomputed permutation.
+        num_modified = shuffle_and_count.get('modified_overhand', 0)
+        num_mongean = shuffle_and_count.get('mongean', 0)
+        card_lst = self._cards[self._pos:]
+        perm = shuffle_algebra.schedule(len(card_lst), num_modified, num_mongean)
+        # Shuffling does not change which cards are left, so the rank
+        # histogram and the count carry on.
+        self._cards = perm.apply(card_lst)
+        self._pos = 0
 
     def deal_hand(self, hand):
         """
         Takes the first card from the deck and adds it to `hand`.
         """
         assert type(hand) == PlayerHand or type(hand) == DealerHand
-        card_lst = self.cards
-        card = card_lst[0]
-        new_card_lst = card_lst[1:]
+        card = self._cards[self._pos]
+        self._pos = self._pos + 1
+        self._counts[card.code // 4] = self._counts[card.code // 4] - 1
         hand.add_card(card)
-        self.cards = new_card_lst
+
+    def draw(self):
+        """
+        Removes the first card from the deck and returns it, without
+        adding it to a hand.
+        """
+        card = self._cards[self._pos]
+        self._pos = self._pos + 1
+        self._counts[card.code // 4] = self._counts[card.code // 4] - 1
+        return card
+
+    def deal_many(self, hand, n):
+        """
+        Takes the first `n` cards from the deck and adds them to `hand`
+        in a single call.
+        """
+        assert type(hand) == PlayerHand or type(hand) == DealerHand
+        assert type(n) == int and 0 <= n <= self.remaining()
+        pos = self._pos
+        self._pos = pos + n
+        cards = self._cards[pos: pos + n]
+        counts = self._counts
+        for i in cards:
+            counts[i.code // 4] = counts[i.code // 4] - 1
+        hand.add_card(*cards)
+
+    def remaining(self):
+        """
+        Returns the number of cards left to deal.
+        """
+        return len(self._cards) - self._pos
+
+    def available(self):
+        """
+        Returns the number of cards the next round can be dealt from, after
+        the shuffle that starts it.
+        """
+        return self.remaining()
 
     def get_cards(self):
-        return self.cards
+        return DeckView(self)
+
+    def rank_counts(self):
+        """
+        Returns the number of undealt cards of each rank, in the order of
+        card.RANKS.
+        """
+        return tuple(self._counts)
+
+    def full_counts(self):
+        """
+        Returns the rank histogram of the whole pack being dealt.
+        """
+        return self._full
+
+    def running_count(self, system=HI_LO):
+        """
+        Returns the running count of the cards dealt so far under the
+        counting.TagSystem `system`.
+        """
+        return system.running_count(self._counts, self._full)
+
+    def true_count(self, system=HI_LO):
+        """
+        Returns the running count per deck left to deal.
+        """
+        return system.true_count(self._counts, self._full)
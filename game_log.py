@@ -0,0 +1,131 @@
+from card import HIDDEN_REPR
+
+# Event kinds
+ROUND = 0
+DEAL = 1
+HIT = 2
+REVEAL = 3
+OUTCOME = 4
+NO_CARDS = 5
+BROKE = 6
+
+
+def _cards_repr(cards):
+    return ' '.join([i.label for i in cards])
+
+
+class GameLog:
+    """
+    Log of a Blackjack game kept as a list of events. The text is only
+    built when render() is called. A disabled log records nothing.
+
+    >>> from card import Card
+    >>> log = GameLog()
+    >>> log.round_start(1, 10, 5)
+    >>> log.deal([Card(10, "spades"), Card("A", "spades")],
+    ...          [Card("Q", "spades"), Card(7, "hearts")])
+    >>> log.hit(Card(2, "clubs"), 'Player')
+    >>> log.reveal([Card(7, "hearts"), Card("Q", "spades")])
+    >>> log.outcome(23, 17, -1)
+    >>> log.broke(0, 5)
+    >>> print(log.render())
+    Round 1 of Blackjack!
+    wallet: 10
+    bet: 5
+    Player Cards: (10, spades) (A, spades)
+    Dealer Cards: (Q, spades) (?, ?)
+    (2, clubs) was pulled by a Player
+    Dealer Cards Revealed: (7, hearts) (Q, spades)
+    Player lost with a score of 23. Dealer won with a score of 17.
+    Wallet amount $0 is less than bet amount $5.
+    >>> log.events[2]
+    (2, (2, clubs), 'Player')
+
+    >>> quiet = GameLog(enabled=False)
+    >>> quiet.round_start(1, 10, 5)
+    >>> quiet.render()
+    ''
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.events = []
+
+    def round_start(self, round_played, wallet, bet):
+        if self.enabled:
+            self.events.append((ROUND, round_played, wallet, bet))
+
+    def deal(self, player_cards, dealer_cards):
+        """
+        Records the opening hands. Only the first dealer card is shown.
+        """
+        if self.enabled:
+            self.events.append((DEAL, tuple(player_cards), tuple(dealer_cards)))
+
+    def hit(self, card, who):
+        """
+        Records `card` being pulled by `who` ('Player' or 'Dealer').
+        """
+        if self.enabled:
+            self.events.append((HIT, card, who))
+
+    def reveal(self, dealer_cards):
+        if self.enabled:
+            self.events.append((REVEAL, tuple(dealer_cards)))
+
+    def outcome(self, player_score, dealer_score, result):
+        if self.enabled:
+            self.events.append((OUTCOME, player_score, dealer_score, result))
+
+    def no_cards(self):
+        if self.enabled:
+            self.events.append((NO_CARDS,))
+
+    def broke(self, wallet, bet):
+        if self.enabled:
+            self.events.append((BROKE, wallet, bet))
+
+    def clear(self):
+        self.events = []
+
+    def render(self):
+        """
+        Returns the text of the log, the same as the old string log.
+        """
+        return ''.join([GameLog.render_event(i) for i in self.events])
+
+    def render_event(event):
+        """
+        Returns the log text of a single event.
+        """
+        kind = event[0]
+        if kind == ROUND:
+            return 'Round ' + str(event[1]) + ' of Blackjack!\n' \
+                + 'wallet: ' + str(event[2]) + '\n' \
+                + 'bet: ' + str(event[3]) + '\n'
+        if kind == DEAL:
+            dealer_cards = event[2]
+            dealer_text = [dealer_cards[0].label] \
+                + [HIDDEN_REPR] * (len(dealer_cards) - 1)
+            return 'Player Cards: ' + _cards_repr(event[1]) + '\n' \
+                + 'Dealer Cards: ' + ' '.join(dealer_text) + '\n'
+        if kind == HIT:
+            return event[1].label + ' was pulled by a ' + event[2] + '\n'
+        if kind == REVEAL:
+            return 'Dealer Cards Revealed: ' + _cards_repr(event[1]) + '\n'
+        if kind == OUTCOME:
+            player_score = str(event[1])
+            dealer_score = str(event[2])
+            if event[3] == 1:
+                return 'Player won with a score of ' + player_score + \
+                    '. Dealer lost with a score of ' + dealer_score + '.\n'
+            if event[3] == -1:
+                return 'Player lost with a score of ' + player_score + \
+                    '. Dealer won with a score of ' + dealer_score + '.\n'
+            return 'Player and Dealer tie.\n'
+        if kind == NO_CARDS:
+            return 'Not enough cards for a game.'
+        if kind == BROKE:
+            return 'Wallet amount $' + str(event[1]) + \
+                ' is less than bet amount $' + str(event[2]) + '.'
+        raise ValueError('unknown log event ' + str(kind))
@@ -1,4 +1,11 @@
-from card import Card
+from card import Card, HIDDEN_STR, HIDDEN_REPR
+from bisect import insort
+from operator import attrgetter
+
+# Card codes follow rank, then spades < hearts < diamonds < clubs, so they
+# are used as the sort key. Card.__lt__ compares codes as well, which lets
+# insort() keep hands in order without a key (a Python 3.10 argument).
+sort_key = attrgetter('code')
 
 class PlayerHand():
     """
@@ -67,22 +74,61 @@ class PlayerHand():
     |__K|
     >>> d_hand
     (4, hearts) (5, spades) (K, diamonds)
+
+    >>> p_hand.score(), p_hand.is_soft(), p_hand.is_bust()
+    (16, True, False)
+    >>> p_hand.add_card(card_6)
+    >>> p_hand.score(), p_hand.is_soft(), p_hand.is_bust()
+    (16, False, False)
+    >>> d_hand.score(), d_hand.is_bust()
+    (19, False)
     """
     
     def __init__(self):
         self.cards = []
+        # Running total with every ace counted as 1, and the number of aces.
+        # score() adds 10 for one ace when that does not go over 21.
+        self.hard = 0
+        self.aces = 0
         
     def add_card(self, *cards):
         """
-        Adds cards to the hand, then sorts
-        them in ascending order.
+        Adds cards to the hand, keeping them
+        in ascending order.
         """
         card_lst = self.cards
         for i in cards:
             assert type(i) == Card
-            card_lst.append(i)
-        self.cards = card_lst
-        self.sort_hand()
+            insort(card_lst, i)
+            self.count_card(i)
+
+    def count_card(self, card):
+        """
+        Adds `card` to the running total of the hand.
+        """
+        if card.rank == 'A':
+            self.aces = self.aces + 1
+            self.hard = self.hard + 1
+        else:
+            self.hard = self.hard + card.points
+
+    def score(self):
+        """
+        Returns the best score of the hand, counting one ace as 11 when
+        that does not go over 21.
+        """
+        if self.aces > 0 and self.hard + 10 <= 21:
+            return self.hard + 10
+        return self.hard
+
+    def is_soft(self):
+        """
+        Returns whether an ace is counted as 11 in the score.
+        """
+        return self.aces > 0 and self.hard + 10 <= 21
+
+    def is_bust(self):
+        return self.hard > 21
 
     def get_cards(self):
         return self.cards            
@@ -93,21 +139,8 @@ class PlayerHand():
         in the hand, with each card on a new line.
         """
         card_lst = self.cards
-        total_text = ''
-        for i in card_lst:
-            rank = str(i.rank)
-            suit = i.c
-            if i.visible == False:
-                rank = '?'
-                suit = '?'
-            text1 = '____\n'
-            text2 = '|' + rank +'  |\n'
-            text3 = '| ' + suit + ' |\n'
-            text4 = '|__' + rank + '|'
-            text = text1 + text2 + text3 + text4
-            total_text = total_text + text + '\n'
-        total_text = total_text[0: -1]
-        return total_text
+        return '\n'.join([card_lst[i].art if self.is_visible(i) else HIDDEN_STR
+                          for i in range(len(card_lst))])
     
     def __repr__(self):
         """
@@ -115,23 +148,21 @@ class PlayerHand():
         each card separated by a space.
         """
         card_lst = self.cards
-        total_text = ''
-        for i in card_lst:
-            rank = str(i.rank)
-            suit = i.suit
-            if i.visible == False:
-                rank = '?'
-                suit = '?'
-            text = '(' + rank + ', ' + suit + ')'
-            total_text = total_text + text + ' '
-        total_text = total_text[0: -1]
-        return total_text
+        return ' '.join([card_lst[i].label if self.is_visible(i)
+                         else HIDDEN_REPR for i in range(len(card_lst))])
+
+    def is_visible(self, index):
+        """
+        Returns whether the card at `index` is shown face up. Every card
+        in a player's hand is visible.
+        """
+        return True
 
     def sort_hand(self):
         """
         Sorts the cards in ascending order.
         """
-        self.cards.sort()
+        self.cards.sort(key=sort_key)
          
         
     
@@ -152,13 +183,21 @@ class DealerHand(PlayerHand):
         """
         if self.hand_visible == False:
             for i in cards:
-                i.set_visible(False)
+                assert type(i) == Card
                 self.cards.append(i)
-            self.cards[0].set_visible(True)
+                self.count_card(i)
         else:
             for i in cards:
-                self.cards.append(i)
-            self.sort_hand()
+                assert type(i) == Card
+                insort(self.cards, i)
+                self.count_card(i)
+
+    def is_visible(self, index):
+        """
+        Returns whether the card at `index` is shown face up. Until the
+        hand is revealed, only the first card dealt is visible.
+        """
+        return self.hand_visible or index == 0
        
     def reveal_hand(self):
         """
@@ -166,9 +205,4 @@ class DealerHand(PlayerHand):
         and sorts them in ascending order.
         """
         self.hand_visible = True
-        for i in self.cards:
-            i.set_visible(True)
         self.sort_hand()
-    
-    
-    
\ No newline at end of file
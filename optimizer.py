@@ -0,0 +1,119 @@
+import numpy as np
+from simulation import (HARD_POINTS, IS_ACE, MIN_BET, MIN_CARDS,
+                        DEALER_THRESHOLD, MAX_VALUE, best_score,
+                        determine_winner, _hit)
+
+THRESHOLDS = np.arange(2, MAX_VALUE + 1)
+
+
+def random_decks(n_decks, seed, num_decks=1):
+    """
+    Returns `n_decks` uniformly shuffled decks (or shoes of `num_decks`
+    decks) as an (n_decks, 52 * num_decks) array of card codes.
+    """
+    rng = np.random.default_rng(seed)
+    cards = np.tile(np.arange(52, dtype=np.uint8), num_decks)
+    return rng.permuted(np.tile(cards, (n_decks, 1)), axis=1)
+
+
+def sweep_thresholds(decks, bet=MIN_BET):
+    """
+    Plays one round on each deck for every stand threshold from 2 to 21
+    and returns the mean and variance of the wallet change per threshold.
+
+    Rounds follow `Blackjack.play_round` on an already shuffled deck: two
+    cards each to the player and dealer in turn, the player hits below the
+    threshold, then the dealer hits below 17. The player draws the same
+    cards whatever the threshold, so the player's hits are dealt once up to
+    21 and each threshold only picks where to stop. The dealer is then
+    played once for each distinct stopping point of a deck rather than
+    once per threshold.
+
+    Parameters:
+        decks: (n_decks, deck_len) array of card codes, top card first.
+        bet: the flat bet of every round.
+    Returns:
+        (thresholds, mean, variance), three arrays of length 20.
+
+    >>> thresholds, mean, var = sweep_thresholds(random_decks(20000, 0))
+    >>> int(thresholds[np.argmax(mean)])
+    17
+    >>> bool(mean[0] < mean[15] and mean[19] < mean[15])
+    True
+
+    Same results as the game's own rules, one threshold at a time:
+    >>> from deck import Deck
+    >>> from hand import PlayerHand, DealerHand
+    >>> from card import Card
+    >>> from blackjack import Blackjack
+    >>> decks = random_decks(100, 1)
+    >>> game = Blackjack(0, logging=False)
+    >>> total = np.zeros(20)
+    >>> for row in decks:
+    ...     for t in range(2, 22):
+    ...         game.deck = Deck()
+    ...         game.deck.cards = [Card.from_code(int(c)) for c in row]
+    ...         player, dealer = PlayerHand(), DealerHand()
+    ...         for j in range(2):
+    ...             game.deck.deal_hand(player)
+    ...             game.deck.deal_hand(dealer)
+    ...         game.hit_or_stand(player, t)
+    ...         dealer.reveal_hand()
+    ...         game.hit_or_stand(dealer, 17)
+    ...         total[t - 2] += 5 * game.determine_winner(
+    ...             Blackjack.calculate_score(player),
+    ...             Blackjack.calculate_score(dealer))
+    >>> bool(np.allclose(total / 100, sweep_thresholds(decks)[1]))
+    True
+    """
+    decks = np.asarray(decks)
+    n_decks, deck_len = decks.shape
+    assert deck_len >= MIN_CARDS
+    length = np.full(n_decks, deck_len, dtype=np.int64)
+
+    # Player scores after 0, 1, 2, ... hits, hitting until 21 or bust.
+    hard = HARD_POINTS[decks[:, 0]] + HARD_POINTS[decks[:, 2]]
+    aces = IS_ACE[decks[:, 0]] + IS_ACE[decks[:, 2]]
+    pos = np.full(n_decks, MIN_CARDS, dtype=np.int64)
+    scores = [best_score(hard, aces)]
+    while 1:
+        hit = (scores[-1] < MAX_VALUE) & (pos < length)
+        rows = np.nonzero(hit)[0]
+        if len(rows) == 0:
+            break
+        codes = decks[rows, pos[rows]]
+        hard = hard.copy()
+        aces = aces.copy()
+        hard[rows] = hard[rows] + HARD_POINTS[codes]
+        aces[rows] = aces[rows] + IS_ACE[codes]
+        pos[rows] = pos[rows] + 1
+        scores.append(best_score(hard, aces))
+    scores = np.stack(scores, axis=1)
+    last = pos - MIN_CARDS
+
+    # Number of hits each threshold takes. A player who runs out of cards
+    # stops at the last hit.
+    valid = np.arange(scores.shape[1])[None, :] <= last[:, None]
+    reached = (scores[:, None, :] >= THRESHOLDS[None, :, None]) \
+        & valid[:, None, :]
+    stop = np.where(reached.any(axis=2), reached.argmax(axis=2),
+                    last[:, None])
+    player_score = np.take_along_axis(scores, stop, axis=1)
+
+    # Play the dealer once per distinct (deck, hits) pair.
+    pairs, which = np.unique(
+        np.stack([np.repeat(np.arange(n_decks), len(THRESHOLDS)),
+                  stop.reshape(-1)], axis=1),
+        axis=0, return_inverse=True)
+    pair_rows = pairs[:, 0]
+    pair_decks = decks[pair_rows]
+    d_hard = HARD_POINTS[pair_decks[:, 1]] + HARD_POINTS[pair_decks[:, 3]]
+    d_aces = IS_ACE[pair_decks[:, 1]] + IS_ACE[pair_decks[:, 3]]
+    d_pos = MIN_CARDS + pairs[:, 1]
+    _hit(pair_decks, length[pair_rows], d_pos, d_hard, d_aces,
+         DEALER_THRESHOLD)
+    dealer_score = best_score(d_hard, d_aces)[which.reshape(-1)]
+
+    result = determine_winner(player_score.reshape(-1), dealer_score)
+    change = bet * result.reshape(n_decks, len(THRESHOLDS)).astype(np.float64)
+    return THRESHOLDS.copy(), change.mean(axis=0), change.var(axis=0)
@@ -0,0 +1,116 @@
+import json
+import marshal
+from os import environ
+from time import perf_counter
+
+# Setting this environment variable to anything but '' or '0' turns the
+# profiler on for every new Blackjack game.
+ENV_VAR = 'BLACKJACK_PROFILE'
+
+
+def enabled_by_env():
+    return environ.get(ENV_VAR, '') not in ('', '0')
+
+
+class Profiler:
+    """
+    Counts calls and wall time of instrumented methods.
+
+    Methods are instrumented on a single object by shadowing them with a
+    timing wrapper, so objects that are not instrumented run their methods
+    untouched. `total_time` includes the time of instrumented methods
+    called from inside, `own_time` does not.
+
+    >>> class Counter:
+    ...     def add(self, n):
+    ...         return self.step(n) + 1
+    ...     def step(self, n):
+    ...         return n
+    >>> counter = Counter()
+    >>> profiler = Profiler()
+    >>> profiler.instrument(counter, ['add', 'step'])
+    >>> counter.add(1), counter.add(2)
+    (2, 3)
+    >>> stats = profiler.get_stats()
+    >>> stats['add']['calls'], stats['step']['calls']
+    (2, 2)
+    >>> stats['add']['total_time'] >= stats['add']['own_time']
+    True
+
+    >>> import os, tempfile, pstats
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'game.prof')
+    >>> profiler.dump_stats(filename)
+    >>> pstats.Stats(filename).total_calls
+    4
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.total_time = {}
+        self.own_time = {}
+        self.functions = {}
+        # Time spent in instrumented calls made by each running call.
+        self._child_time = []
+
+    def instrument(self, obj, names):
+        """
+        Replaces each method in `names` on `obj` with a timed version.
+        """
+        for name in names:
+            method = getattr(obj, name)
+            setattr(obj, name, self.wrap(name, method))
+
+    def wrap(self, name, func):
+        """
+        Returns `func` wrapped so its calls are counted under `name`.
+        """
+        self.calls.setdefault(name, 0)
+        self.total_time.setdefault(name, 0.0)
+        self.own_time.setdefault(name, 0.0)
+        self.functions[name] = getattr(func, '__func__', func)
+        child_time = self._child_time
+
+        def timed(*args, **kwargs):
+            child_time.append(0.0)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                inner = child_time.pop()
+                self.calls[name] = self.calls[name] + 1
+                self.total_time[name] = self.total_time[name] + elapsed
+                self.own_time[name] = self.own_time[name] + elapsed - inner
+                if len(child_time) > 0:
+                    child_time[-1] = child_time[-1] + elapsed
+        return timed
+
+    def get_stats(self):
+        """
+        Returns {name: {'calls', 'total_time', 'own_time'}}, times in
+        seconds.
+        """
+        return {name: {'calls': self.calls[name],
+                       'total_time': self.total_time[name],
+                       'own_time': self.own_time[name]}
+                for name in self.calls}
+
+    def to_json(self):
+        return json.dumps(self.get_stats(), indent=2, sort_keys=True)
+
+    def dump_stats(self, filename):
+        """
+        Writes the stats in the format of cProfile's dump_stats, so they
+        can be read with pstats.Stats(filename).
+        """
+        stats = {}
+        for name in self.calls:
+            code = getattr(self.functions[name], '__code__', None)
+            if code is None:
+                key = ('~', 0, name)
+            else:
+                key = (code.co_filename, code.co_firstlineno, name)
+            stats[key] = (self.calls[name], self.calls[name],
+                          self.own_time[name], self.total_time[name], {})
+        with open(filename, 'wb') as f:
+            marshal.dump(stats, f)
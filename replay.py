@@ -0,0 +1,115 @@
+import argparse
+from blackjack import Blackjack
+import checkpoint
+from summary_writer import MemorySink
+
+
+def nearest_checkpoint(states, round_number):
+    """
+    Returns the last checkpoint written before round `round_number` was
+    played. Checkpoints are searched in the order they were written, so a
+    checkpoint from the start of a play_round() call is preferred over one
+    taken at the same round at the end of the previous call.
+    """
+    found = None
+    for i in states:
+        if i['round'] < round_number:
+            found = i
+    if found is None:
+        raise ValueError('no checkpoint before round ' + str(round_number))
+    return found
+
+
+def replay_round(filename, round_number, **kwargs):
+    """
+    Plays round `round_number` of a game again from the nearest checkpoint
+    in the checkpoint file `filename`, without touching the game's files
+    or numpy's global generator.
+    Other arguments (such as the strategy or bet policy the game used) are
+    passed to Blackjack().
+
+    Returns:
+        A dictionary with the log and summary text of the round, the
+        result, and the wallet and bet after it.
+
+    >>> from summary_writer import SummaryDirectory
+    >>> summaries = SummaryDirectory()
+    >>> from numpy.random import MT19937, RandomState
+    >>> from shoe import Shoe
+    >>> game = Blackjack(100, rng=RandomState(MT19937(8)), deck=Shoe(2),
+    ...                  checkpoint_every=10)
+    >>> game.play_round(25, 15)
+    >>> game.close()
+    >>> log = game.get_log()
+    >>> round_17 = replay_round(game.checkpoint_filename(), 17)
+    >>> print(round_17['log'].split('\\n')[0])
+    Round 17 of Blackjack!
+    >>> round_17['log'] in log
+    True
+    >>> with open(game.summary_filename(), encoding='utf-8') as f:
+    ...     round_17['summary'] in f.read()
+    True
+    >>> replay_round(game.checkpoint_filename(), 25)['wallet'] == game.wallet
+    True
+
+    Games on numpy's global generator replay the same way:
+    >>> import numpy as np
+    >>> np.random.seed(4)
+    >>> shared = Blackjack(100, checkpoint_every=3)
+    >>> shared.play_round(8, 15)
+    >>> shared.close()
+    >>> def global_state():
+    ...     state = np.random.get_state()
+    ...     return state[1].tolist(), state[2]
+    >>> before = global_state()
+    >>> replay_round(shared.checkpoint_filename(), 5)['log'] in shared.get_log()
+    True
+    >>> global_state() == before
+    True
+    >>> replay_round(game.checkpoint_filename(), 10000)
+    Traceback (most recent call last):
+    ...
+    ValueError: round 41 was not played
+    >>> summaries.close()
+    """
+    state = nearest_checkpoint(checkpoint.read_checkpoints(filename),
+                               round_number)
+    game_num = Blackjack.game_num
+    game = Blackjack.from_checkpoint(state, private_rng=True, **kwargs)
+    Blackjack.game_num = game_num
+    game.summary = MemorySink()
+    stand_threshold = state['stand_threshold']
+    min_bet = state['min_bet']
+    while game.round_played < round_number:
+        if game.round_played == round_number - 1:
+            game.reset_log()
+            wallet = game.wallet
+        played = game.play_next_round(stand_threshold, min_bet)
+        if not played:
+            raise ValueError('round ' + str(game.round_played + 1)
+                             + ' was not played')
+    records = game.summary.records
+    return {
+        'log': game.get_log(),
+        'summary': records[-1] if len(records) > 0 else None,
+        'result': game.session_stats.last_result,
+        'wallet': game.wallet,
+        'bet': game.bet,
+        'wallet_change': game.wallet - wallet,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay one round of a checkpointed Blackjack game.')
+    parser.add_argument('checkpoints', help='game_checkpointX.jsonl file')
+    parser.add_argument('round', type=int, help='round number to replay')
+    args = parser.parse_args()
+    replayed = replay_round(args.checkpoints, args.round)
+    print(replayed['log'])
+    if replayed['summary'] is not None:
+        print(replayed['summary'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+from multiprocessing import Pool
+from numpy.random import MT19937, RandomState, SeedSequence
+from blackjack import Blackjack
+from session_stats import SessionStats
+
+
+def session_rng(seed_seq):
+    """
+    Returns the generator given to one game. It has the `randint` method
+    `Blackjack.play_round` calls.
+    """
+    return RandomState(MT19937(seed_seq))
+
+
+def _play_session(args):
+    """
+    Plays one game in a worker and returns (wallet, rounds played, session
+    statistics snapshot).
+    """
+    game_number, wallet, num_rounds, stand_threshold, seed_seq = args
+    # Game numbers are fixed by the session index, so the summary files do
+    # not depend on which worker plays the game.
+    Blackjack.game_num = game_number - 1
+    with Blackjack(wallet, rng=session_rng(seed_seq)) as game:
+        game.play_round(num_rounds, stand_threshold)
+    return game.wallet, game.round_played, game.session_stats.snapshot()
+
+
+def run_sessions(wallets, num_rounds, stand_threshold, master_seed,
+                 workers=1, first_game=None):
+    """
+    Plays one `Blackjack(wallet).play_round(num_rounds, stand_threshold)`
+    game for each wallet over a pool of `workers` processes.
+
+    Each game gets its own generator spawned from `master_seed`, so the
+    results only depend on the master seed and not on the worker count.
+    Game i writes its summary as game number `first_game + i`, and games
+    are numbered after the games of this process by default. Games made
+    afterwards are numbered after the last session.
+
+    Returns:
+        A dictionary with the final wallet and rounds played of each game,
+        the total number of rounds, the mean wallet change and the
+        SessionStats of all games merged in game order.
+
+    >>> import os
+    >>> from summary_writer import SummaryDirectory
+    >>> summaries = SummaryDirectory()
+    >>> wallets = [10, 50, 100, 500] * 5
+    >>> serial = run_sessions(wallets, 10, 15, master_seed=42)
+    >>> parallel = run_sessions(wallets, 10, 15, master_seed=42, workers=3)
+    >>> serial == parallel
+    True
+    >>> serial['total_rounds']
+    157
+    >>> stats = serial['stats']
+    >>> stats.rounds, stats.total == sum(serial['wallets']) - sum(wallets)
+    (157, True)
+    >>> len(os.listdir('game_summaries'))
+    40
+
+    Sessions never write to the files of the process's own games:
+    >>> mine = Blackjack(50)
+    >>> mine.play_round(2, 15)
+    >>> mine.close()
+    >>> with open(mine.summary_filename(), encoding='utf-8') as f:
+    ...     before = f.read()
+    >>> sessions = run_sessions([10, 20], 3, 15, 1)
+    >>> with open(mine.summary_filename(), encoding='utf-8') as f:
+    ...     f.read() == before
+    True
+    >>> Blackjack(10).game_number == mine.game_number + 3
+    True
+    >>> summaries.close()
+    """
+    assert type(workers) == int and workers > 0
+    if first_game is None:
+        first_game = Blackjack.game_num + 1
+    children = SeedSequence(master_seed).spawn(len(wallets))
+    jobs = [(first_game + i, wallets[i], num_rounds, stand_threshold,
+             children[i]) for i in range(len(wallets))]
+    if workers == 1:
+        game_num = Blackjack.game_num
+        outcomes = [_play_session(i) for i in jobs]
+        Blackjack.game_num = game_num
+    else:
+        with Pool(workers) as pool:
+            outcomes = pool.map(_play_session, jobs)
+    # Later games of this process must not take the sessions' numbers.
+    Blackjack.game_num = max(Blackjack.game_num,
+                             first_game + len(wallets) - 1)
+    final_wallets = [i[0] for i in outcomes]
+    rounds_played = [i[1] for i in outcomes]
+    stats = SessionStats()
+    for i in outcomes:
+        stats = stats.merge(SessionStats.from_snapshot(i[2]))
+    if len(wallets) == 0:
+        mean_change = 0.0
+    else:
+        mean_change = (sum(final_wallets) - sum(wallets)) / len(wallets)
+    return {
+        'wallets': final_wallets,
+        'rounds_played': rounds_played,
+        'total_rounds': sum(rounds_played),
+        'mean_wallet_change': mean_change,
+        'stats': stats,
+    }
@@ -0,0 +1,253 @@
+MAX_VALUE = 21
+# Score histograms have one bin per score, and the last bin also holds
+# every score above it.
+NUM_SCORES = 32
+
+
+class SessionStats:
+    """
+    Running statistics of the rounds of a session, kept in constant memory:
+    win, loss and tie counts, the mean and variance of the wallet change of
+    a round (from its integer sum and sum of squares), bust counts, score histograms, the longest
+    run of each result and the largest drop of the wallet from a high.
+
+    Two accumulators merge into the one that would have seen the rounds of
+    `self` followed by the rounds of `other`, so sessions split over
+    workers combine into exactly the same statistics.
+
+    >>> stats = SessionStats()
+    >>> rounds = [(20, 18, 1, 5), (22, 17, -1, 10), (17, 22, 1, 5),
+    ...           (19, 19, 0, 10), (15, 20, -1, 10), (14, 21, -1, 5)]
+    >>> for i in rounds:
+    ...     stats.record(*i)
+    >>> stats.wins, stats.losses, stats.ties
+    (2, 3, 1)
+    >>> stats.mean(), round(stats.variance(), 4)
+    (-2.5, 47.5)
+    >>> stats.longest_streak(1), stats.longest_streak(-1)
+    (1, 2)
+    >>> stats.max_drawdown, round(stats.player_bust_rate(), 4)
+    (20, 0.1667)
+
+    >>> first, second = SessionStats(), SessionStats()
+    >>> for i in rounds[:3]:
+    ...     first.record(*i)
+    >>> for i in rounds[3:]:
+    ...     second.record(*i)
+    >>> first.merge(second) == stats
+    True
+
+    Any split merges back exactly:
+    >>> import random
+    >>> rng = random.Random(5)
+    >>> rounds = [(20, 18, rng.choice([-1, 0, 1]), rng.choice([5, 10, 35]))
+    ...           for i in range(300)]
+    >>> whole = SessionStats()
+    >>> for i in rounds:
+    ...     whole.record(*i)
+    >>> same = []
+    >>> for split in range(301):
+    ...     first, second = SessionStats(), SessionStats()
+    ...     for i in rounds[:split]:
+    ...         first.record(*i)
+    ...     for i in rounds[split:]:
+    ...         second.record(*i)
+    ...     same.append(first.merge(second) == whole)
+    >>> all(same)
+    True
+    """
+
+    def __init__(self):
+        self.rounds = 0
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        # Wallet changes are integers, so their sums merge exactly.
+        self.sum_delta = 0
+        self.sum_squares = 0
+        self.player_busts = 0
+        self.dealer_busts = 0
+        self.player_scores = [0] * NUM_SCORES
+        self.dealer_scores = [0] * NUM_SCORES
+        # Runs of equal results, indexed by result + 1. The first and last
+        # runs are kept so merged sessions can join them.
+        self.longest = [0, 0, 0]
+        self.first_result = 0
+        self.first_run = 0
+        self.last_result = 0
+        self.last_run = 0
+        # Wallet change since the start, its highest and lowest values and
+        # the largest fall from a high.
+        self.total = 0
+        self.peak = 0
+        self.trough = 0
+        self.max_drawdown = 0
+
+    def record(self, player_score, dealer_score, result, bet):
+        """
+        Adds a round with the final scores, its `result` (1, 0 or -1) and
+        the `bet` it was played for.
+        """
+        delta = int(result * bet)
+        self.rounds = self.rounds + 1
+        if result == 1:
+            self.wins = self.wins + 1
+        elif result == -1:
+            self.losses = self.losses + 1
+        else:
+            self.ties = self.ties + 1
+        self.sum_delta = self.sum_delta + delta
+        self.sum_squares = self.sum_squares + delta * delta
+        if player_score > MAX_VALUE:
+            self.player_busts = self.player_busts + 1
+        if dealer_score > MAX_VALUE:
+            self.dealer_busts = self.dealer_busts + 1
+        player_bin = min(player_score, NUM_SCORES - 1)
+        dealer_bin = min(dealer_score, NUM_SCORES - 1)
+        self.player_scores[player_bin] = self.player_scores[player_bin] + 1
+        self.dealer_scores[dealer_bin] = self.dealer_scores[dealer_bin] + 1
+
+        if self.rounds > 1 and result == self.last_result:
+            if self.first_run == self.rounds - 1:
+                self.first_run = self.first_run + 1
+            self.last_run = self.last_run + 1
+        else:
+            if self.rounds == 1:
+                self.first_result = result
+                self.first_run = 1
+            self.last_result = result
+            self.last_run = 1
+        if self.last_run > self.longest[result + 1]:
+            self.longest[result + 1] = self.last_run
+
+        self.total = self.total + delta
+        if self.total > self.peak:
+            self.peak = self.total
+        if self.total < self.trough:
+            self.trough = self.total
+        if self.peak - self.total > self.max_drawdown:
+            self.max_drawdown = self.peak - self.total
+
+    def merge(self, other):
+        """
+        Returns the statistics of the rounds of `self` followed by the
+        rounds of `other`. Neither is changed.
+        """
+        if other.rounds == 0:
+            return SessionStats.from_snapshot(self.snapshot())
+        if self.rounds == 0:
+            return SessionStats.from_snapshot(other.snapshot())
+        merged = SessionStats()
+        n = self.rounds + other.rounds
+        merged.rounds = n
+        merged.wins = self.wins + other.wins
+        merged.losses = self.losses + other.losses
+        merged.ties = self.ties + other.ties
+        merged.sum_delta = self.sum_delta + other.sum_delta
+        merged.sum_squares = self.sum_squares + other.sum_squares
+        merged.player_busts = self.player_busts + other.player_busts
+        merged.dealer_busts = self.dealer_busts + other.dealer_busts
+        merged.player_scores = [i + j for i, j in zip(self.player_scores,
+                                                      other.player_scores)]
+        merged.dealer_scores = [i + j for i, j in zip(self.dealer_scores,
+                                                      other.dealer_scores)]
+
+        merged.longest = [max(i, j) for i, j in zip(self.longest,
+                                                    other.longest)]
+        merged.first_result = self.first_result
+        merged.first_run = self.first_run
+        merged.last_result = other.last_result
+        merged.last_run = other.last_run
+        if self.last_result == other.first_result:
+            joined = self.last_run + other.first_run
+            kind = self.last_result + 1
+            merged.longest[kind] = max(merged.longest[kind], joined)
+            if self.first_run == self.rounds:
+                merged.first_run = self.rounds + other.first_run
+            if other.last_run == other.rounds:
+                merged.last_run = other.rounds + self.last_run
+
+        merged.total = self.total + other.total
+        merged.peak = max(self.peak, self.total + other.peak)
+        merged.trough = min(self.trough, self.total + other.trough)
+        merged.max_drawdown = max(self.max_drawdown, other.max_drawdown,
+                                  self.peak - self.total - other.trough)
+        return merged
+
+    def snapshot(self):
+        """
+        Returns the state as a dictionary of plain values, which can be
+        sent between processes and turned back with from_snapshot().
+        """
+        state = dict(self.__dict__)
+        state['player_scores'] = list(self.player_scores)
+        state['dealer_scores'] = list(self.dealer_scores)
+        state['longest'] = list(self.longest)
+        return state
+
+    @classmethod
+    def from_snapshot(cls, state):
+        stats = cls()
+        stats.__dict__.update(state)
+        stats.player_scores = list(stats.player_scores)
+        stats.dealer_scores = list(stats.dealer_scores)
+        stats.longest = list(stats.longest)
+        return stats
+
+    def __eq__(self, other):
+        return type(other) == SessionStats \
+            and self.snapshot() == other.snapshot()
+
+    def mean(self):
+        """
+        Returns the mean wallet change of a round.
+        """
+        if self.rounds == 0:
+            return 0.0
+        return self.sum_delta / self.rounds
+
+    def variance(self):
+        """
+        Returns the sample variance of the wallet change of a round.
+        """
+        n = self.rounds
+        if n < 2:
+            return 0.0
+        return (n * self.sum_squares - self.sum_delta * self.sum_delta) \
+            / (n * (n - 1))
+
+    def player_bust_rate(self):
+        if self.rounds == 0:
+            return 0.0
+        return self.player_busts / self.rounds
+
+    def dealer_bust_rate(self):
+        if self.rounds == 0:
+            return 0.0
+        return self.dealer_busts / self.rounds
+
+    def longest_streak(self, result):
+        """
+        Returns the most rounds in a row that ended with `result`.
+        """
+        return self.longest[result + 1]
+
+    def get_summary(self):
+        """
+        Returns the statistics as a dictionary.
+        """
+        return {
+            'rounds': self.rounds,
+            'wins': self.wins,
+            'losses': self.losses,
+            'ties': self.ties,
+            'mean_delta': self.mean(),
+            'variance_delta': self.variance(),
+            'player_bust_rate': self.player_bust_rate(),
+            'dealer_bust_rate': self.dealer_bust_rate(),
+            'player_scores': list(self.player_scores),
+            'dealer_scores': list(self.dealer_scores),
+            'longest_win_streak': self.longest_streak(1),
+            'longest_loss_streak': self.longest_streak(-1),
+            'max_drawdown': self.max_drawdown,
+        }
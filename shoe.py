@@ -0,0 +1,99 @@
+from card import Card
+from deck import Deck
+
+
+class Shoe(Deck):
+    """
+    Shoe of `num_decks` 52-card decks with a cut card.
+
+    A Shoe is dealt and shuffled like a Deck. Dealt cards are kept as
+    discards, and once the share of the shoe dealt reaches `penetration`
+    the next shuffle puts the discards back and shuffles the whole shoe.
+    It does the same when fewer cards are left than a round needs, so a
+    game never stops on a shoe that can be reshuffled.
+
+    >>> from hand import PlayerHand
+    >>> shoe = Shoe(num_decks=6, penetration=0.5)
+    >>> shoe.size, shoe.remaining()
+    (312, 312)
+    >>> shoe.get_cards()[:5]
+    [(2, spades), (2, hearts), (2, diamonds), (2, clubs), (3, spades)]
+    >>> shoe.shuffle(modified_overhand=2, mongean=3)
+    >>> shoe.deal_many(PlayerHand(), 150)
+    >>> shoe.shuffle(mongean=1)
+    >>> shoe.remaining(), shoe.reshuffles
+    (162, 0)
+    >>> shoe.deal_many(PlayerHand(), 10)
+    >>> shoe.shuffle(mongean=1)
+    >>> shoe.remaining(), shoe.reshuffles
+    (312, 1)
+    >>> sorted(shoe.get_cards()) == sorted(Card.CARDS * 6)
+    True
+
+    Discards stay counted until the shoe is reshuffled:
+    >>> shoe.deal_many(PlayerHand(), 100)
+    >>> counted = shoe.running_count()
+    >>> shoe.shuffle(mongean=2)
+    >>> shoe.running_count() == counted, shoe.reshuffles
+    (True, 1)
+    >>> shoe.deal_many(PlayerHand(), 100)
+    >>> shoe.shuffle(mongean=2)
+    >>> shoe.running_count(), shoe.rank_counts()[0]
+    (0, 24)
+
+    A cut card at the very end still leaves every round playable:
+    >>> from numpy.random import MT19937, RandomState
+    >>> from blackjack import Blackjack
+    >>> game = Blackjack(10 ** 6, rng=RandomState(MT19937(1)), logging=False,
+    ...                  deck=Shoe(1, penetration=1.0), headless=True)
+    >>> game.play_round(60, 17)
+    >>> game.round_played, game.deck.reshuffles > 0
+    (60, True)
+    """
+
+    # Fewest cards a round is dealt from, as in Blackjack.play_round.
+    min_cards = 4
+
+    def __init__(self, num_decks=6, penetration=0.75):
+        """
+        Creates a shoe of `num_decks` decks in ascending order.
+        """
+        assert type(num_decks) == int and num_decks > 0
+        assert 0 < penetration <= 1
+        super().__init__()
+        self.cards = list(Card.CARDS) * num_decks
+        self.size = len(self._cards)
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self._discards = []
+        self.reshuffles = 0
+
+    def needs_reshuffle(self):
+        """
+        Returns whether the cut card has been reached, or fewer cards are
+        left than a round needs.
+        """
+        if self.remaining() < Shoe.min_cards:
+            return True
+        return self.size - self.remaining() >= self.penetration * self.size
+
+    def available(self):
+        """
+        Returns the number of cards the next round can be dealt from, the
+        whole shoe if the next shuffle reshuffles it.
+        """
+        if self.needs_reshuffle():
+            return self.size
+        return self.remaining()
+
+    def shuffle(self, **shuffle_and_count):
+        """
+        Shuffles the cards left in the shoe, or the whole shoe once the cut
+        card has been reached. Takes the same arguments as Deck.shuffle.
+        """
+        self._discards.extend(self._cards[:self._pos])
+        if self.needs_reshuffle():
+            self.cards = self._cards[self._pos:] + self._discards
+            self._discards = []
+            self.reshuffles = self.reshuffles + 1
+        super().shuffle(**shuffle_and_count)
@@ -1,3 +1,10 @@
+from functools import lru_cache
+
+# Most permutation tables kept. A shoe has fewer cards every round, so
+# tables of old lengths are dropped instead of kept for the whole shoe.
+CACHE_SIZE = 2 ** 10
+
+
 class Shuffle:
     """
     Different kinds of shuffling techniques.
@@ -21,8 +28,16 @@ class Shuffle:
     >>> mod_oh_even = Shuffle.modified_overhand(odd_cards, 2)
     >>> mod_oh_even
     [1, 2, 3, 4, 5]
+
+    >>> Shuffle.mongean(odd_cards)
+    [4, 2, 1, 3, 5]
+    >>> Shuffle.mongean_table(6)
+    (5, 3, 1, 0, 2, 4)
     """     
         
+    # Entry i of a permutation table is the index of the card that ends up
+    # at position i.
+
     def modified_overhand(cards, num):
         """
         Takes `num` cards from the middle of the deck and puts them at the
@@ -32,32 +47,29 @@ class Shuffle:
         top half of the deck.
         """
         
-        # Use Recursion.
         # Note that the top of the deck is the card at index 0.
         assert type(cards) == list
         assert type(num) == int
         assert num <= len(cards)
         assert num >= 0
-        length = len(cards)
-        if num == 0:
-            return cards
-        else:
-            if length % 2 == 1 and num % 2 == 1:
-                start = int(length / 2 - num / 2)
-                end = int(length / 2 + num / 2)
-            if length % 2 == 0 and num % 2 == 0:
-                start = int(length / 2 - num / 2)
-                end = int(length / 2 + num / 2)
-            if length % 2 == 1 and num % 2 == 0:
-                start = int(length / 2 - num / 2 - 0.5)
-                end = int(length / 2 + num / 2 - 0.5)
-            if length % 2 == 0 and num % 2 == 1:
-                start = int(length / 2 - num / 2 - 0.5)
-                end = int(length / 2 + num / 2 - 0.5)
-            shuffled_cards = cards[start: end]
-            new_cards = shuffled_cards + cards[0: start] + cards[end: ]
-            return Shuffle.modified_overhand(new_cards, num - 1)
-                    
+        table = Shuffle.overhand_table(len(cards), num)
+        return [cards[i] for i in table]
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def overhand_table(length, num):
+        """
+        Returns the permutation applied by `modified_overhand` with `num` on
+        a deck of `length` cards. Recently used tables are cached.
+        """
+        table = list(range(length))
+        while num > 0:
+            # Same as the middle slice chosen for every parity of
+            # `length` and `num`.
+            start = (length - num) // 2
+            end = start + num
+            table = table[start: end] + table[0: start] + table[end: ]
+            num = num - 1
+        return tuple(table)
 
     def mongean(cards):
         """
@@ -66,19 +78,30 @@ class Shuffle:
         """
         
         # Remember that the "top" of the deck is the first item in the list.
-        # Use Recursion. Can use helper functions.
-        
-        length = len(cards)
-        if length == 0:
-            return []
-        elif length == 1:
-            return cards
-        else:
+        table = Shuffle.mongean_table(len(cards))
+        return [cards[i] for i in table]
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def mongean_table(length):
+        """
+        Returns the permutation applied by `mongean` on a deck of `length`
+        cards. Recently used tables are cached.
+
+        The last two cards go to the top and bottom, then the shuffle is
+        repeated on the rest of the deck, which keeps the parity of `length`.
+        """
+        top = []
+        bottom = []
+        n = length
+        while n >= 2:
             if length % 2 == 0:
-                top = [cards[-1]]
-                bottom = [cards[-2]]
-                return top + Shuffle.mongean(cards[0: -2]) + bottom
+                top.append(n - 1)
+                bottom.append(n - 2)
             else:
-                top = [cards[-2]]
-                bottom = [cards[-1]]
-                return top + Shuffle.mongean(cards[0: -2]) + bottom
+                top.append(n - 2)
+                bottom.append(n - 1)
+            n = n - 2
+        if n == 1:
+            top.append(0)
+        bottom.reverse()
+        return tuple(top + bottom)
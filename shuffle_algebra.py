@@ -0,0 +1,195 @@
+from array import array
+from functools import lru_cache
+from shuffle import Shuffle
+from math import lcm
+
+# Most schedules kept, enough for every deck length and pair of counts of
+# an 8-deck shoe. Older ones are dropped, so longer shoes stay bounded.
+CACHE_SIZE = 2 ** 13
+
+
+class Permutation:
+    """
+    A shuffle written as a permutation of deck positions.
+
+    `table[i]` is the index of the card that ends up at position i, so a
+    permutation is applied with a single gather. Applying `p` and then `q`
+    is `p * q`, and `p ** k` applies `p` k times. Tables are arrays of
+    16-bit indexes, a quarter of the size of a tuple, so many cached
+    schedules fit in little memory.
+
+    >>> p = Permutation.mongean(52)
+    >>> p.order()
+    12
+    >>> (p ** 12).is_identity()
+    True
+    >>> cards = list(range(52))
+    >>> (p ** 3).apply(cards) == Shuffle.mongean(Shuffle.mongean(Shuffle.mongean(cards)))
+    True
+    >>> (p ** 1000003).table == (p ** (1000003 % 12)).table
+    True
+
+    >>> q = Permutation.modified_overhand(52, 2)
+    >>> (q * p).apply(cards) == Shuffle.mongean(Shuffle.modified_overhand(cards, 2))
+    True
+
+    >>> Permutation.mongean(6).cycles()
+    [[0, 5, 4, 2, 1, 3]]
+    >>> Permutation.mongean(10).cycle_type()
+    [1, 3, 6]
+    """
+
+    __slots__ = ('table', '_cycles')
+
+    def __init__(self, table):
+        self.table = array('H' if len(table) <= 2 ** 16 else 'I', table)
+        self._cycles = None
+
+    def mongean(length):
+        """
+        Returns the permutation of one Mongean shuffle on `length` cards.
+        """
+        return Permutation(Shuffle.mongean_table(length))
+
+    def modified_overhand(length, num):
+        """
+        Returns the permutation of `Shuffle.modified_overhand` with `num`.
+        """
+        assert type(num) == int
+        assert 0 <= num <= length
+        return Permutation(Shuffle.overhand_table(length, num))
+
+    def identity(length):
+        return Permutation(range(length))
+
+    def __len__(self):
+        return len(self.table)
+
+    def __mul__(self, other):
+        """
+        Returns the permutation that applies `self` and then `other`.
+        """
+        assert len(self) == len(other)
+        table = self.table
+        return Permutation([table[i] for i in other.table])
+
+    def __pow__(self, count):
+        """
+        Returns the permutation that applies `self` `count` times. Each
+        cycle is rotated by `count` modulo its own length, so the cost does
+        not depend on `count`. Small counts are composed directly, which
+        is faster than walking the cycles.
+        """
+        assert type(count) == int and count >= 0
+        if 0 < count <= 8:
+            table = self.table
+            power = table
+            for i in range(count - 1):
+                power = [power[j] for j in table]
+            return Permutation(power)
+        new_table = list(range(len(self)))
+        for cycle in self.cycles():
+            size = len(cycle)
+            step = count % size
+            if step == 0:
+                continue
+            for j in range(size):
+                new_table[cycle[j]] = cycle[(j + step) % size]
+        return Permutation(new_table)
+
+    def apply(self, cards):
+        """
+        Returns a new list with `cards` rearranged by this permutation.
+        """
+        return [cards[i] for i in self.table]
+
+    def cycles(self):
+        """
+        Returns the cycles of the permutation. Each cycle starts at its
+        smallest position and follows position i to table[i].
+        """
+        if self._cycles is None:
+            table = self.table
+            seen = [False] * len(table)
+            cycle_lst = []
+            for start in range(len(table)):
+                if seen[start]:
+                    continue
+                cycle = []
+                i = start
+                while not seen[i]:
+                    seen[i] = True
+                    cycle.append(i)
+                    i = table[i]
+                cycle_lst.append(cycle)
+            self._cycles = cycle_lst
+        return self._cycles
+
+    def cycle_type(self):
+        """
+        Returns the sorted cycle lengths.
+        """
+        return sorted(len(i) for i in self.cycles())
+
+    def order(self):
+        """
+        Returns the number of times the permutation has to be applied to
+        restore the deck.
+        """
+        return lcm(*self.cycle_type()) if len(self) > 0 else 1
+
+    def is_identity(self):
+        return list(self.table) == list(range(len(self)))
+
+    def __repr__(self):
+        return 'Permutation(' + str(list(self.table)) + ')'
+
+
+def schedule(length, modified_overhand=0, mongean=0):
+    """
+    Returns the single permutation for `Deck.shuffle` with the given counts:
+    one modified overhand shuffle with `modified_overhand`, then `mongean`
+    Mongean shuffles.
+
+    >>> cards = list(range(52))
+    >>> expected = Shuffle.modified_overhand(cards, 4)
+    >>> for i in range(5):
+    ...     expected = Shuffle.mongean(expected)
+    >>> schedule(52, 4, 5).apply(cards) == expected
+    True
+    >>> schedule(52, 0, 24).is_identity()
+    True
+    """
+    assert type(mongean) == int and mongean >= 0
+    return _schedule(length, modified_overhand, mongean % order(length))
+
+
+# Schedules are cached with the mongean count already reduced by the order
+# of the Mongean permutation. A shoe has fewer cards every round, so the
+# cache is bounded like the permutation tables.
+@lru_cache(maxsize=CACHE_SIZE)
+def _schedule(length, modified_overhand, mongean):
+    perm = Permutation.modified_overhand(length, modified_overhand)
+    if mongean > 0:
+        perm = perm * (_mongean(length) ** mongean)
+    return perm
+
+
+# The Mongean permutation of each length, kept with its cycles so powers
+# of it are cheap to build again.
+@lru_cache(maxsize=CACHE_SIZE)
+def _mongean(length):
+    return Permutation.mongean(length)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def order(length):
+    """
+    Returns the number of Mongean shuffles that restore a `length` card deck.
+
+    >>> order(52)
+    12
+    >>> [order(i) for i in range(1, 9)]
+    [1, 2, 2, 3, 3, 6, 6, 4]
+    """
+    return _mongean(length).order()
@@ -0,0 +1,223 @@
+import numpy as np
+from numpy.random import RandomState
+from card import Card
+from batch_shuffle import shuffle_batch
+from betting import ProgressionPolicy
+
+DECK_SIZE = 52
+MIN_BET = 5
+MIN_CARDS = 4
+DEALER_THRESHOLD = 17
+MAX_VALUE = 21
+
+# Blackjack points by card code, with aces counted as 1. The extra 10 for a
+# soft ace is added in `best_score`.
+HARD_POINTS = np.array(
+    [1 if i.rank == 'A' else i.points for i in Card.CARDS], dtype=np.int64)
+IS_ACE = np.array([i.rank == 'A' for i in Card.CARDS], dtype=np.int64)
+
+
+def best_score(hard, aces):
+    """
+    Returns the score `Blackjack.calculate_score` gives a hand with hard
+    total `hard` (aces counted as 1) and `aces` aces. Works on arrays.
+    """
+    soft = (aces > 0) & (hard + 10 <= MAX_VALUE)
+    return np.where(soft, hard + 10, hard)
+
+
+def determine_winner(player_score, dealer_score):
+    """
+    Vectorized `Blackjack.determine_winner`: 1 if the player won, 0 for a
+    tie and -1 if the dealer won.
+
+    >>> determine_winner(np.array([10, 21, 22, 12, 22, 2]),
+    ...                  np.array([12, 21, 23, 2, 2, 22]))
+    array([-1,  0,  0,  1, -1,  1], dtype=int8)
+    """
+    player_bust = player_score > MAX_VALUE
+    dealer_bust = dealer_score > MAX_VALUE
+    result = np.sign(player_score - dealer_score).astype(np.int8)
+    result[player_bust] = -1
+    result[dealer_bust] = 1
+    result[player_bust & dealer_bust] = 0
+    return result
+
+
+def draw_shuffle_counts(seeds, num_rounds):
+    """
+    Draws the shuffle counts of `num_rounds` rounds for each seed, in the
+    same order `Blackjack.play_round` draws them from a generator seeded
+    with that seed.
+
+    Returns:
+        An int array of shape (len(seeds), num_rounds, 2) holding the
+        modified overhand count, then the Mongean count, of each round.
+    """
+    counts = np.empty((len(seeds), num_rounds, 2), dtype=np.int64)
+    for i in range(len(seeds)):
+        draws = RandomState(seeds[i]).randint(0, 5, size=(num_rounds, 2))
+        # play_round draws the Mongean count first.
+        counts[i, :, 0] = draws[:, 1]
+        counts[i, :, 1] = draws[:, 0]
+    return counts
+
+
+def _hit(decks, length, pos, hard, aces, threshold):
+    """
+    Deals cards from `decks` into every hand whose score is below
+    `threshold` until it stands or its deck runs out.
+    """
+    while 1:
+        hit = (best_score(hard, aces) < threshold) & (pos < length)
+        rows = np.nonzero(hit)[0]
+        if len(rows) == 0:
+            return
+        codes = decks[rows, pos[rows]]
+        hard[rows] = hard[rows] + HARD_POINTS[codes]
+        aces[rows] = aces[rows] + IS_ACE[codes]
+        pos[rows] = pos[rows] + 1
+
+
+def true_counts(decks, length, system):
+    """
+    Returns the true count under `system` of each row of `decks`, whose
+    first `length` cards are left to deal from a 52-card deck, the same as
+    Deck.true_count. Returns zeros when `system` is None.
+    """
+    if system is None:
+        return np.zeros(len(decks))
+    tags = np.array(system.tags, dtype=np.int64)[np.arange(DECK_SIZE) // 4]
+    left = np.arange(decks.shape[1])[None, :] < length[:, None]
+    running = system.initial_count(1) + tags.sum() \
+        - (tags[decks] * left).sum(axis=1)
+    return running * DECK_SIZE / np.maximum(length, 1)
+
+
+def simulate(wallets, num_rounds, stand_threshold, shuffle_counts,
+             bet_policy=None):
+    """
+    Plays `num_rounds` rounds of Blackjack at many tables at once, with the
+    same rules as `Blackjack.play_round` on a new `Blackjack(wallet)`.
+
+    Each table starts with a new ordered deck. Every round the remaining
+    cards are shuffled, two cards are dealt to the player and the dealer in
+    turn, the player hits below `stand_threshold`, the dealer hits below 17
+    and the bet goes up by 5 after a win and down by 5 (to at least 5) after
+    a loss, unless a betting.BetPolicy `bet_policy` is given. A table stops
+    once it has fewer than 4 cards or the wallet is less than the bet.
+
+    Parameters:
+        wallets: starting wallet of each table.
+        num_rounds (int): Number of rounds to play.
+        stand_threshold: threshold for all tables, or one per table.
+        shuffle_counts: array of shape (n_tables, num_rounds, 2) with the
+        overhand and Mongean counts of each round, see `draw_shuffle_counts`.
+    Returns:
+        (results, wallets, rounds_played): results has shape
+        (n_tables, num_rounds) and holds 1, 0 or -1 for each round played
+        (0 after a table stopped), wallets holds the final wallets and
+        rounds_played the number of rounds each table played.
+
+    >>> from summary_writer import SummaryDirectory
+    >>> summaries = SummaryDirectory()
+    >>> from numpy.random import seed
+    >>> from blackjack import Blackjack
+    >>> seeds = list(range(40))
+    >>> wallets = np.array([10, 50, 100, 500] * 10)
+    >>> counts = draw_shuffle_counts(seeds, 15)
+    >>> results, final, played = simulate(wallets, 15, 15, counts)
+    >>> scalar = []
+    >>> for i in range(40):
+    ...     seed(seeds[i])
+    ...     game = Blackjack(int(wallets[i]))
+    ...     game.play_round(15, 15)
+    ...     scalar.append((game.wallet, game.round_played))
+    >>> scalar == list(zip(final.tolist(), played.tolist()))
+    True
+    >>> results[0, :played[0]]
+    array([-1,  0,  1, -1], dtype=int8)
+
+    >>> from betting import KellyPolicy
+    >>> policy = KellyPolicy(edge_per_count=0.05)
+    >>> results, final, played = simulate(wallets, 15, 15, counts, policy)
+    >>> scalar = []
+    >>> for i in range(40):
+    ...     seed(seeds[i])
+    ...     game = Blackjack(int(wallets[i]), bet_policy=policy)
+    ...     game.play_round(15, 15)
+    ...     scalar.append((game.wallet, game.round_played))
+    >>> scalar == list(zip(final.tolist(), played.tolist()))
+    True
+    >>> summaries.close()
+    """
+    assert type(num_rounds) == int and num_rounds > 0
+    wallet = np.array(wallets, dtype=np.int64)
+    n_tables = len(wallet)
+    threshold = np.empty(n_tables, dtype=np.int64)
+    threshold[:] = stand_threshold
+    assert (threshold > 1).all()
+    shuffle_counts = np.asarray(shuffle_counts)
+    assert shuffle_counts.shape == (n_tables, num_rounds, 2)
+
+    decks = np.tile(np.arange(DECK_SIZE, dtype=np.uint8), (n_tables, 1))
+    length = np.full(n_tables, DECK_SIZE, dtype=np.int64)
+    if bet_policy is None:
+        bet_policy = ProgressionPolicy()
+    system = bet_policy.system
+    bet = np.array(bet_policy.initial_bets(
+        wallet, MIN_BET, true_counts(decks, length, system)), dtype=np.int64)
+    active = np.ones(n_tables, dtype=bool)
+    rounds_played = np.zeros(n_tables, dtype=np.int64)
+    results = np.zeros((n_tables, num_rounds), dtype=np.int8)
+    columns = np.arange(DECK_SIZE)
+
+    for r in range(num_rounds):
+        active = active & (length >= MIN_CARDS) & (wallet >= bet)
+        rows = np.nonzero(active)[0]
+        if len(rows) == 0:
+            break
+        rounds_played[rows] = rounds_played[rows] + 1
+
+        # Remaining cards sit at the front of each row, so tables with the
+        # same number of cards left are shuffled together.
+        row_length = length[rows]
+        sub = decks[rows]
+        for size in np.unique(row_length):
+            group = np.nonzero(row_length == size)[0]
+            counts = shuffle_counts[rows[group], r]
+            sub[group, :size] = shuffle_batch(
+                sub[group, :size], counts[:, 0], counts[:, 1])
+
+        # Cards 0 and 2 go to the player, cards 1 and 3 to the dealer.
+        p_hard = HARD_POINTS[sub[:, 0]] + HARD_POINTS[sub[:, 2]]
+        p_aces = IS_ACE[sub[:, 0]] + IS_ACE[sub[:, 2]]
+        d_hard = HARD_POINTS[sub[:, 1]] + HARD_POINTS[sub[:, 3]]
+        d_aces = IS_ACE[sub[:, 1]] + IS_ACE[sub[:, 3]]
+        pos = np.full(len(rows), MIN_CARDS, dtype=np.int64)
+        _hit(sub, row_length, pos, p_hard, p_aces, threshold[rows])
+        _hit(sub, row_length, pos, d_hard, d_aces, DEALER_THRESHOLD)
+
+        result = determine_winner(best_score(p_hard, p_aces),
+                                  best_score(d_hard, d_aces))
+        results[rows, r] = result
+        row_wallet = wallet[rows]
+        row_bet = bet[rows]
+        won = result == 1
+        lost = result == -1
+        row_wallet = row_wallet + np.where(won, row_bet, 0) \
+            - np.where(lost, row_bet, 0)
+        wallet[rows] = row_wallet
+
+        # Drop the dealt cards from the front of each deck.
+        index = np.minimum(columns[None, :] + pos[:, None], DECK_SIZE - 1)
+        sub = np.take_along_axis(sub, index, axis=1)
+        decks[rows] = sub
+        row_length = row_length - pos
+        length[rows] = row_length
+
+        # The next bet sees the count of the cards left, like a game does.
+        bet[rows] = bet_policy.next_bets(row_bet, result, row_wallet, MIN_BET,
+                                         true_counts(sub, row_length, system))
+
+    return results, wallet, rounds_played
@@ -0,0 +1,110 @@
+import numpy as np
+from dealer_odds import value_index, NUM_VALUES
+
+# Decision tables are indexed by [total, soft, upcard]. Totals go up to 31,
+# the most a hand can reach before it stops, and every total over 21
+# stands, except in ThresholdStrategy tables. `soft` is 1 when an ace is counted as 11, and the upcard index is
+# the dealer's first card as in dealer_odds (0 for an ace, 9 for tens).
+NUM_TOTALS = 32
+MAX_VALUE = 21
+
+
+class Strategy:
+    """
+    Player strategy compiled into a table of hit (True) or stand (False)
+    decisions, so a decision is a single array read.
+
+    >>> from card import Card
+    >>> strategy = ThresholdStrategy(15)
+    >>> strategy.hit(14, False, Card("K", "spades"))
+    True
+    >>> strategy.hit(15, True, Card("K", "spades"))
+    False
+
+    Decisions also work on arrays of totals, softness and upcard indexes:
+    >>> basic = BasicStrategy()
+    >>> basic.table[[12, 12, 16, 18], [0, 0, 0, 1], [3, 6, 9, 8]]
+    array([False,  True,  True,  True])
+
+    >>> table = np.zeros((NUM_TOTALS, 2, NUM_VALUES), dtype=bool)
+    >>> table[:12] = True
+    >>> Strategy(table).hit(11, False, Card(6, "hearts"))
+    True
+    """
+
+    def __init__(self, table):
+        table = np.array(table, dtype=bool)
+        assert table.shape == (NUM_TOTALS, 2, NUM_VALUES)
+        table[MAX_VALUE + 1:] = False
+        self.table = table
+
+    def hit(self, total, soft, upcard):
+        """
+        Returns whether a hand with score `total` (soft when an ace counts
+        as 11) should hit against the dealer's `upcard` Card.
+        """
+        return bool(self.table[total, int(soft), value_index(upcard)])
+
+
+class ThresholdStrategy(Strategy):
+    """
+    Hits while the score is below `stand_threshold`, which is what
+    `Blackjack.play_round` does by default. Like the default, a hand over 21
+    keeps hitting below a threshold above 22, so the table has a row for
+    every total up to the threshold plus a ten.
+
+    >>> from numpy.random import RandomState
+    >>> from blackjack import Blackjack
+    >>> default = Blackjack(100, rng=RandomState(3), headless=True)
+    >>> default.play_round(30, 25)
+    >>> table = Blackjack(100, rng=RandomState(3), headless=True,
+    ...                   strategy=ThresholdStrategy(25))
+    >>> table.play_round(30, 25)
+    >>> default.wallet, table.wallet
+    (70, 70)
+    """
+
+    def __init__(self, stand_threshold):
+        assert type(stand_threshold) == int and stand_threshold > 1
+        self.stand_threshold = stand_threshold
+        # The highest total is a hard stand_threshold - 1 plus a ten.
+        num_totals = max(NUM_TOTALS, stand_threshold + 10)
+        hit = np.arange(num_totals) < stand_threshold
+        self.table = np.broadcast_to(hit[:, None, None],
+                                     (num_totals, 2, NUM_VALUES)).copy()
+
+
+class BasicStrategy(Strategy):
+    """
+    Hit/stand basic strategy for a dealer standing on all 17s. Doubling and
+    splitting are not part of this game, so only hit and stand are used.
+
+    Against an ace, hard 12 to 16 hit, hard 17 stands, soft 18 stands and
+    soft 17 hits:
+    >>> from card import Card
+    >>> basic = BasicStrategy()
+    >>> ace = Card("A", "hearts")
+    >>> [basic.hit(i, False, ace) for i in range(12, 18)]
+    [True, True, True, True, True, False]
+    >>> basic.hit(17, True, ace), basic.hit(18, True, ace)
+    (True, False)
+    >>> basic.hit(18, True, Card(9, "hearts"))
+    True
+    """
+
+    def __init__(self):
+        table = np.zeros((NUM_TOTALS, 2, NUM_VALUES), dtype=bool)
+        # Upcard indexes: 0 is an ace, 1 to 8 are 2 to 9, 9 is a ten.
+        strong = [True, False, False, False, False, False, True, True, True,
+                  True]
+        # Hard totals.
+        table[:12, 0] = True
+        table[12, 0] = [True, True, True, False, False, False, True, True,
+                        True, True]
+        table[13:17, 0] = strong
+        # Soft totals.
+        table[:18, 1] = True
+        table[18, 1] = [False, False, False, False, False, False, False,
+                        False, True, True]
+        super().__init__(table)
+
@@ -0,0 +1,159 @@
+import os
+import tempfile
+from os.path import getsize, exists
+
+
+class SummaryWriter:
+    """
+    Append-only writer for a game_summaryX.txt file.
+
+    The file is opened once, records are kept in memory and written every
+    `flush_every` records (or only on flush() when `flush_every` is None).
+    Records are separated by a blank line, the same as when each round
+    reopened the file.
+
+    >>> import os, tempfile
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'summary.txt')
+    >>> with SummaryWriter(filename, flush_every=2) as writer:
+    ...     writer.write('ROUND 1:\\n')
+    ...     os.path.exists(filename)
+    ...     writer.write('ROUND 2:\\n')
+    ...     writer.write('ROUND 3:\\n')
+    False
+    >>> writer = SummaryWriter(filename)
+    >>> writer.write('ROUND 4:\\n')
+    >>> writer.close()
+    >>> with open(filename, encoding='utf-8') as f:
+    ...     print(f.read())
+    ROUND 1:
+    <BLANKLINE>
+    ROUND 2:
+    <BLANKLINE>
+    ROUND 3:
+    <BLANKLINE>
+    ROUND 4:
+    <BLANKLINE>
+    """
+
+    def __init__(self, filename, flush_every=None):
+        assert flush_every is None or (type(flush_every) == int
+                                       and flush_every > 0)
+        self.filename = filename
+        self.flush_every = flush_every
+        self.file = None
+        self.buffer = []
+        # Records appended to an existing summary still need a separator.
+        self.first_written = exists(filename) and getsize(filename) > 0
+
+    def write(self, record):
+        """
+        Adds `record` to the buffer, flushing it if it is full.
+        """
+        if self.first_written:
+            record = '\n' + record
+        self.buffer.append(record)
+        self.first_written = True
+        if self.flush_every is not None and \
+                len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        if len(self.buffer) == 0:
+            return
+        if self.file is None:
+            self.file = open(self.filename, 'a', encoding='utf-8')
+        self.file.write(''.join(self.buffer))
+        self.file.flush()
+        self.buffer = []
+
+    def close(self):
+        """
+        Flushes the buffered records and closes the file.
+        """
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MemorySink:
+    """
+    Summary sink keeping records in memory instead of writing them, for
+    replays, benchmarks and tournament tables. `filename` is where the
+    records belong, if anywhere.
+
+    >>> sink = MemorySink('game_summaries/game_summary1.txt')
+    >>> sink.write('ROUND 1:\\n')
+    >>> sink.take(), sink.records
+    (['ROUND 1:\\n'], [])
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def take(self):
+        """
+        Returns the records and forgets them.
+        """
+        records = self.records
+        self.records = []
+        return records
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SummaryDirectory:
+    """
+    Moves to a new temporary working directory with an empty
+    game_summaries directory, so examples can play games without touching
+    the real summaries. close() goes back to the previous working
+    directory and removes the temporary one.
+
+    >>> start = os.getcwd()
+    >>> summaries = SummaryDirectory()
+    >>> os.listdir('game_summaries'), os.getcwd() == start
+    ([], False)
+    >>> summaries.close()
+    >>> os.getcwd() == start, os.path.exists(summaries.path)
+    (True, False)
+    """
+
+    def __init__(self):
+        self.previous = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        os.chdir(self.path)
+        os.mkdir('game_summaries')
+
+    def close(self):
+        os.chdir(self.previous)
+        self.directory.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,217 @@
+import asyncio
+from time import perf_counter
+import numpy as np
+from numpy.random import SeedSequence
+from blackjack import Blackjack
+from runner import session_rng
+from summary_writer import MemorySink, SummaryWriter
+
+
+async def _write_output(queue):
+    """
+    Background task writing (filename, texts) batches from `queue` until it
+    gets None. Summary batches go through a SummaryWriter per file so the
+    separators match a game played alone, and log batches are appended as
+    they are. Disk writes run in a worker thread so tables keep playing.
+    """
+    writers = {}
+
+    def write_batch(filename, texts, is_summary):
+        if is_summary:
+            writer = writers.get(filename)
+            if writer is None:
+                writer = SummaryWriter(filename)
+                writers[filename] = writer
+            for text in texts:
+                writer.write(text)
+            # Closing keeps one handle open at a time however many tables
+            # there are. The writer remembers where it was.
+            writer.close()
+        else:
+            with open(filename, 'a', encoding='utf-8') as f:
+                f.write(''.join(texts))
+
+    while 1:
+        item = await queue.get()
+        try:
+            if item is None:
+                return
+            await asyncio.to_thread(write_batch, *item)
+        finally:
+            queue.task_done()
+
+
+async def _wait_with_writer(task, writer):
+    """
+    Waits for `task` and returns its result. If the writer task stops first
+    (which it only does when a write failed), `task` is cancelled and the
+    writer's error is raised, so nothing waits on a queue nobody reads.
+    """
+    await asyncio.wait([task, writer], return_when=asyncio.FIRST_COMPLETED)
+    if not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return writer.result()
+    return task.result()
+
+
+async def _play_table(game, num_rounds, stand_threshold, queue, batch,
+                      log_filename, latencies):
+    """
+    Plays one table round by round, yielding to the other tables after each
+    round and sending its output to `queue` every `batch` rounds.
+    """
+    sink = game.summary
+
+    async def send():
+        records = sink.take()
+        if len(records) > 0:
+            await queue.put((sink.filename, records, True))
+        if log_filename is not None:
+            text = game.get_log()
+            game.reset_log()
+            if text != '':
+                await queue.put((log_filename, [text], False))
+
+    game.reset_bet()
+    for i in range(num_rounds):
+        start = perf_counter()
+        played = game.play_next_round(stand_threshold)
+        if not played or len(sink.records) >= batch:
+            await send()
+        if not played:
+            break
+        latencies.append(perf_counter() - start)
+        await asyncio.sleep(0)
+    await send()
+
+
+async def tournament(num_tables, num_rounds, stand_threshold=17, wallet=100,
+                     master_seed=0, queue_size=256, batch=16, write_logs=False,
+                     deck_factory=None, bet_policy=None):
+    """
+    Plays `num_tables` Blackjack games of `num_rounds` rounds as asyncio
+    tasks. Summaries (and logs, with `write_logs`) are sent to a single
+    writer task over a queue holding at most `queue_size` batches; tables
+    wait when it is full.
+
+    Each table gets a generator spawned from `master_seed` and writes the
+    same game_summaryX.txt (and game_logX.txt) as the game played alone
+    with `play_round(num_rounds, stand_threshold)`.
+
+    Parameters:
+        stand_threshold: one threshold, or a list with one per table.
+        wallet: one starting wallet, or a list with one per table.
+        deck_factory: called to make each table's deck, Deck by default.
+        bet_policy: betting.BetPolicy used at every table.
+    Returns:
+        A dictionary with the games, the rounds played, the elapsed time,
+        the rounds per second and the 50th, 90th and 99th percentile round
+        latency in seconds. Latency includes waiting for room in the queue.
+    """
+    if type(stand_threshold) == int:
+        stand_threshold = [stand_threshold] * num_tables
+    if type(wallet) == int:
+        wallet = [wallet] * num_tables
+    assert len(stand_threshold) == num_tables and len(wallet) == num_tables
+    children = SeedSequence(master_seed).spawn(num_tables)
+
+    queue = asyncio.Queue(maxsize=queue_size)
+    writer = asyncio.create_task(_write_output(queue))
+    games = []
+    tasks = []
+    latencies = []
+    start = perf_counter()
+    for i in range(num_tables):
+        deck = None if deck_factory is None else deck_factory()
+        game = Blackjack(wallet[i], rng=session_rng(children[i]),
+                         logging=write_logs, deck=deck,
+                         bet_policy=bet_policy)
+        game.summary = MemorySink('game_summaries/game_summary'
+                                  + str(game.game_number) + '.txt')
+        log_filename = None
+        if write_logs:
+            log_filename = 'game_summaries/game_log' \
+                + str(game.game_number) + '.txt'
+        games.append(game)
+        tasks.append(asyncio.create_task(_play_table(
+            game, num_rounds, stand_threshold[i], queue, batch,
+            log_filename, latencies)))
+    try:
+        await _wait_with_writer(asyncio.gather(*tasks), writer)
+        await _wait_with_writer(asyncio.create_task(queue.put(None)), writer)
+        await writer
+    finally:
+        if not writer.done():
+            writer.cancel()
+    elapsed = perf_counter() - start
+
+    rounds = sum([i.round_played for i in games])
+    if len(latencies) > 0:
+        percentiles = np.percentile(latencies, [50, 90, 99]).tolist()
+    else:
+        percentiles = [0.0, 0.0, 0.0]
+    return {
+        'games': games,
+        'rounds': rounds,
+        'elapsed': elapsed,
+        'rounds_per_second': rounds / elapsed if elapsed > 0 else 0.0,
+        'latency_p50': percentiles[0],
+        'latency_p90': percentiles[1],
+        'latency_p99': percentiles[2],
+    }
+
+
+def run_tournament(num_tables, num_rounds, **kwargs):
+    """
+    Runs `tournament` to completion. Takes the same arguments.
+
+    >>> import os
+    >>> from summary_writer import SummaryDirectory
+    >>> summaries = SummaryDirectory()
+    >>> stats = run_tournament(40, 20, stand_threshold=list(range(2, 22)) * 2,
+    ...                        master_seed=7, queue_size=4, batch=3,
+    ...                        write_logs=True)
+    >>> stats['rounds'] == sum([i.round_played for i in stats['games']])
+    True
+    >>> stats['latency_p50'] <= stats['latency_p99']
+    True
+
+    Every table wrote what it writes when played alone:
+    >>> children = SeedSequence(7).spawn(40)
+    >>> same = []
+    >>> for i in range(40):
+    ...     table = stats['games'][i]
+    ...     alone = Blackjack(100, rng=session_rng(children[i]))
+    ...     alone.play_round(20, list(range(2, 22))[i % 20])
+    ...     alone.close()
+    ...     with open('game_summaries/game_summary'
+    ...               + str(table.game_number) + '.txt', 'rb') as f:
+    ...         ours = f.read()
+    ...     with open('game_summaries/game_summary'
+    ...               + str(alone.game_number) + '.txt', 'rb') as f:
+    ...         theirs = f.read()
+    ...     with open('game_summaries/game_log'
+    ...               + str(table.game_number) + '.txt',
+    ...               encoding='utf-8') as f:
+    ...         log = f.read()
+    ...     same.append(ours == theirs and log == alone.get_log()
+    ...                 and table.wallet == alone.wallet)
+    >>> all(same)
+    True
+    >>> summaries.close()
+
+    A failed write stops the tournament with its error:
+    >>> summaries = SummaryDirectory()
+    >>> os.rmdir('game_summaries')
+    >>> run_tournament(4, 20, queue_size=2, batch=1)
+    ... # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    FileNotFoundError: no game_summaries directory
+    >>> summaries.close()
+    """
+    return asyncio.run(tournament(num_tables, num_rounds, **kwargs))